@@ -1,8 +1,10 @@
 import os
+import click
 from flask import Flask, render_template
 from flask_migrate import Migrate
 from config import Config
 from myextensions import db, login_manager
+from utils.db_engine import apply_pool_options, configure_engine
 from datetime import datetime
 from flask_login import current_user
 
@@ -12,7 +14,9 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    apply_pool_options(app)
     db.init_app(app)
+    configure_engine(app)
     login_manager.init_app(app)
     migrate.init_app(app, db)
 
@@ -54,6 +58,8 @@ def create_app(config_class=Config):
     with app.app_context():
         from models import User, Student, Event, Course, Staff, Question, FeedbackResponse, GeneralFeedback
         db.create_all()
+        from utils.feedback_inbox import ensure_feedback_search_index
+        ensure_feedback_search_index()
 
         # Create admin and default questions if not present
         admin = User.query.filter_by(username='admin').first()
@@ -99,6 +105,31 @@ def create_app(config_class=Config):
                 db.session.add(Question(id=i, text=q_text))
             db.session.commit()
 
+    @app.cli.command('rebuild-summaries')
+    @click.option('--event-id', type=int, default=None, help='Only rebuild this event.')
+    def rebuild_summaries_command(event_id):
+        """Recompute the result_summary table from raw feedback responses."""
+        from utils.result_summary import rebuild_summaries
+        rows = rebuild_summaries(event_id)
+        click.echo(f'Rebuilt {rows} result summary rows.')
+
+    @app.cli.command('export-responses')
+    @click.argument('event_id', type=int)
+    @click.argument('output', type=click.Path(dir_okay=False, writable=True))
+    @click.option('--format', 'fmt', type=click.Choice(['csv', 'parquet']), default='csv', show_default=True)
+    @click.option('--chunk-size', type=int, default=None, help='Rows fetched per round trip.')
+    def export_responses_command(event_id, output, fmt, chunk_size):
+        """Stream every rating of an event to a CSV or Parquet file."""
+        from utils.response_export import iter_export
+        try:
+            stream = iter_export(event_id, fmt, chunk_size=chunk_size or app.config['EXPORT_CHUNK_SIZE'])
+        except RuntimeError as e:
+            raise click.ClickException(str(e))
+        with open(output, 'wb') as f:
+            for chunk in stream:
+                f.write(chunk)
+        click.echo(f'Exported event {event_id} to {output}.')
+
     @app.route('/')
     def index():
         return render_template('base.html')
@@ -0,0 +1,145 @@
+"""
+Before/after benchmark for the feedback hot-path indexes.
+
+Seeds a throwaway SQLite database, then runs the query shapes used by the dashboards
+against the pre-index schema ("before": no model indexes and no unique constraint on
+feedback_response, whose autoindex would otherwise serve the event/student lookups)
+and the current schema ("after"), printing the EXPLAIN QUERY PLAN and the median time
+of each. Exits non-zero if any query plan is unchanged.
+
+Usage: python benchmarks/bench_indexes.py [--students 5000] [--events 4] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sqlalchemy import Column, MetaData, Table, text
+from config import Config
+from app import create_app
+from myextensions import db
+from models import FeedbackResponse
+
+QUERIES = [
+    ('responded students (dashboard)',
+     'SELECT DISTINCT student_id FROM feedback_response WHERE event_id = :event_id', {}),
+    ('has submitted (student dashboard)',
+     'SELECT id FROM feedback_response WHERE student_id = :student_id AND event_id = :event_id LIMIT 1', {}),
+    ('staff responses (results)',
+     'SELECT COUNT(DISTINCT student_id) FROM feedback_response WHERE event_id = :event_id AND staff_id = :staff_id', {}),
+    ('ratings per response (api_responses)',
+     'SELECT question_id, rating FROM question_response WHERE feedback_id = :feedback_id', {}),
+    ('category inbox (general feedback)',
+     'SELECT id FROM general_feedback WHERE category = :category ORDER BY timestamp DESC LIMIT 50', {}),
+    ('student history',
+     'SELECT id FROM general_feedback WHERE student_id = :student_id ORDER BY timestamp DESC', {}),
+    ('active event',
+     'SELECT id FROM event WHERE is_active = 1 AND is_deleted = 0 LIMIT 1', {}),
+]
+
+def seed(conn, students, events, courses=8, staff_per_course=2, questions=15, feedback_per_student=8):
+    rnd = random.Random(42)
+    now = datetime.utcnow()
+    conn.execute(text('INSERT INTO student (roll_number, name, password_hash) VALUES (:r, :n, :p)'),
+                 [{'r': f'718123{i:05d}', 'n': f'Student {i}', 'p': 'x'} for i in range(1, students + 1)])
+    conn.execute(text('INSERT INTO course (code, name) VALUES (:c, :n)'),
+                 [{'c': f'C{i:03d}', 'n': f'Course {i}'} for i in range(1, courses + 1)])
+    conn.execute(text('INSERT INTO staff (name, course_id) VALUES (:n, :c)'),
+                 [{'n': f'Staff {c}-{s}', 'c': c} for c in range(1, courses + 1) for s in range(staff_per_course)])
+    conn.execute(text('INSERT INTO event (title, is_active, is_deleted, is_open_to_all) VALUES (:t, :a, 0, 1)'),
+                 [{'t': f'Event {e}', 'a': e == events} for e in range(1, events + 1)])
+    feedback, ratings = [], []
+    fid = 0
+    for event_id in range(1, events + 1):
+        for student_id in range(1, students + 1):
+            for course_id in range(1, min(courses, feedback_per_student) + 1):
+                fid += 1
+                staff_id = (course_id - 1) * staff_per_course + rnd.randrange(staff_per_course) + 1
+                feedback.append({'id': fid, 's': student_id, 'e': event_id, 'c': course_id, 'st': staff_id})
+                ratings.extend({'f': fid, 'q': q, 'r': rnd.randint(1, 4)} for q in range(1, questions + 1))
+    conn.execute(text('INSERT INTO feedback_response (id, student_id, event_id, course_id, staff_id) '
+                      'VALUES (:id, :s, :e, :c, :st)'), feedback)
+    conn.execute(text('INSERT INTO question_response (feedback_id, question_id, rating) VALUES (:f, :q, :r)'),
+                 ratings)
+    categories = ['fc', 'library', 'transport', 'sports', 'bookdepot', 'general']
+    conn.execute(text('INSERT INTO general_feedback (category, content, student_id, timestamp, is_resolved) '
+                      'VALUES (:c, :t, :s, :ts, 0)'),
+                 [{'c': rnd.choice(categories), 't': 'feedback', 's': rnd.randint(1, students),
+                   'ts': now - timedelta(minutes=i)} for i in range(students * 2)])
+    return {'event_id': events, 'student_id': students // 2, 'staff_id': 3,
+            'feedback_id': fid // 2, 'category': 'fc'}
+
+def bare_table(table):
+    """Same columns as ``table`` without its constraints and indexes."""
+    return Table(table.name, MetaData(),
+                 *[Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable) for c in table.columns])
+
+def restore_table(conn, table):
+    """Recreate ``table`` from the model, with its constraints and indexes, keeping its rows."""
+    conn.execute(text(f'ALTER TABLE {table.name} RENAME TO {table.name}_bare'))
+    table.create(conn)
+    conn.execute(text(f'INSERT INTO {table.name} SELECT * FROM {table.name}_bare'))
+    conn.execute(text(f'DROP TABLE {table.name}_bare'))
+
+def run_queries(conn, params, repeat):
+    results = {}
+    for name, sql, extra in QUERIES:
+        bound = {k: v for k, v in {**params, **extra}.items() if f':{k}' in sql}
+        plan = [row[-1] for row in conn.execute(text('EXPLAIN QUERY PLAN ' + sql), bound)]
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(text(sql), bound).fetchall()
+            timings.append(time.perf_counter() - start)
+        results[name] = (plan, statistics.median(timings) * 1000)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--students', type=int, default=5000)
+    parser.add_argument('--events', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            indexes = [ix for table in db.metadata.sorted_tables for ix in table.indexes]
+            responses = FeedbackResponse.__table__
+            with db.engine.begin() as conn:
+                responses.drop(conn)
+                bare_table(responses).create(conn)
+                for ix in indexes:
+                    ix.drop(conn, checkfirst=True)
+                params = seed(conn, args.students, args.events)
+                conn.execute(text('ANALYZE'))
+            with db.engine.connect() as conn:
+                before = run_queries(conn, params, args.repeat)
+            with db.engine.begin() as conn:
+                restore_table(conn, responses)
+                for ix in indexes:
+                    ix.create(conn, checkfirst=True)
+                conn.execute(text('ANALYZE'))
+            with db.engine.connect() as conn:
+                after = run_queries(conn, params, args.repeat)
+
+    for name, _, _ in QUERIES:
+        (plan_before, ms_before), (plan_after, ms_after) = before[name], after[name]
+        print(f'== {name}')
+        print(f'   before: {ms_before:8.3f} ms  | ' + '; '.join(plan_before))
+        print(f'   after:  {ms_after:8.3f} ms  | ' + '; '.join(plan_after))
+
+    unchanged = [name for name, _, _ in QUERIES if before[name][0] == after[name][0]]
+    if unchanged:
+        sys.exit('plan unchanged by the indexes: ' + ', '.join(unchanged))
+
+if __name__ == '__main__':
+    main()
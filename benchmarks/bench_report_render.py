@@ -0,0 +1,70 @@
+"""
+Per-report render time for the staff feedback PDFs.
+
+Renders synthetic report data (no database needed) one report at a time with
+render_pdf_report and through the process pool used for the event ZIP, printing the
+mean and median milliseconds per report.
+
+Usage: python benchmarks/bench_report_render.py [--reports 200] [--questions 15] [--workers 4]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.pdf_generator import render_pdf_report
+from utils.report_bundle import iter_rendered_reports
+
+def make_reports(count, questions):
+    rnd = random.Random(42)
+    reports = []
+    for i in range(count):
+        total = rnd.randint(40, 70)
+        reports.append({
+            'event_title': 'Mid Semester Feedback',
+            'course_code': f'C{i % 40:03d}',
+            'course_name': f'Course {i % 40}',
+            'staff_name': f'Staff {i}',
+            'question_data': [(f'Question {q + 1}: how would you rate this aspect of the course?',
+                               round(rnd.uniform(1, 4), 2), rnd.randint(20, total)) for q in range(questions)],
+            'responded_students': rnd.randint(20, total),
+            'total_students': total,
+        })
+    return reports
+
+def bench_single(reports):
+    timings = []
+    for report in reports:
+        start = time.perf_counter()
+        render_pdf_report(report)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def bench_pool(reports, workers):
+    items = [(f'report_{i}.pdf', report) for i, report in enumerate(reports)]
+    start = time.perf_counter()
+    for _ in iter_rendered_reports(items, max_workers=workers):
+        pass
+    return [(time.perf_counter() - start) / len(reports)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, default=200)
+    parser.add_argument('--questions', type=int, default=15)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    reports = make_reports(args.reports, args.questions)
+    render_pdf_report(reports[0])  # warm up fonts and imports
+
+    print(f'{args.reports} reports, {args.questions} questions each')
+    for name, timings in [('single', bench_single(reports)),
+                          (f'pool x{args.workers}', bench_pool(reports, args.workers))]:
+        print(f'  {name:<10} mean {statistics.mean(timings) * 1000:7.2f} ms/report'
+              f'  median {statistics.median(timings) * 1000:7.2f} ms/report')
+
+if __name__ == '__main__':
+    main()
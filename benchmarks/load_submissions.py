@@ -0,0 +1,105 @@
+"""
+Concurrent feedback-submission load test.
+
+Seeds a throwaway SQLite database with an active event, then has N threads post the
+student feedback form at once (one submission per student) and reports sustained
+submissions per second, latency percentiles and "database is locked" failures.
+Run it with and without --no-pragmas to compare the tuned and default engine setup.
+
+Usage: python benchmarks/load_submissions.py [--students 600] [--threads 16] [--no-pragmas]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sqlalchemy import text
+from config import Config
+from app import create_app
+from myextensions import db
+
+def seed(students, courses, staff_per_course):
+    db.session.execute(text('INSERT INTO student (roll_number, name, password_hash) VALUES (:r, :n, :p)'),
+                       [{'r': f'718123{i:05d}', 'n': f'Student {i}', 'p': 'x'} for i in range(1, students + 1)])
+    db.session.execute(text('INSERT INTO course (code, name) VALUES (:c, :n)'),
+                       [{'c': f'C{i:03d}', 'n': f'Course {i}'} for i in range(1, courses + 1)])
+    db.session.execute(text('INSERT INTO staff (name, course_id) VALUES (:n, :c)'),
+                       [{'n': f'Staff {c}-{s}', 'c': c} for c in range(1, courses + 1) for s in range(staff_per_course)])
+    db.session.execute(text("INSERT INTO event (id, title, is_active, is_deleted, is_open_to_all) "
+                            "VALUES (1, 'Load test', 1, 0, 1)"))
+    db.session.execute(text('INSERT INTO event_course (event_id, course_id) VALUES (1, :c)'),
+                       [{'c': c} for c in range(1, courses + 1)])
+    db.session.commit()
+    staff_by_course = {}
+    for staff_id, course_id in db.session.execute(text('SELECT id, course_id FROM staff')):
+        staff_by_course.setdefault(course_id, []).append(staff_id)
+    question_ids = [row[0] for row in db.session.execute(text('SELECT id FROM question'))]
+    return staff_by_course, question_ids
+
+def build_form(rnd, staff_by_course, question_ids):
+    form = {}
+    for course_id, staff_ids in staff_by_course.items():
+        form[f'staff_{course_id}'] = str(rnd.choice(staff_ids))
+        for question_id in question_ids:
+            form[f'rating_{course_id}_0_{question_id}'] = str(rnd.randint(1, 4))
+    return form
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--students', type=int, default=600)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--courses', type=int, default=8)
+    parser.add_argument('--no-pragmas', action='store_true', help='Use SQLite defaults (rollback journal, no busy timeout).')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class LoadConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, 'load.db')
+            SQLITE_PRAGMAS = {} if args.no_pragmas else Config.SQLITE_PRAGMAS
+
+        app = create_app(LoadConfig)
+        with app.app_context():
+            staff_by_course, question_ids = seed(args.students, args.courses, 2)
+
+        rnd = random.Random(7)
+        forms = [build_form(rnd, staff_by_course, question_ids) for _ in range(args.students)]
+
+        def submit(student_id):
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess['student_id'] = student_id
+            start = time.perf_counter()
+            try:
+                response = client.post('/student/feedback', data=forms[student_id - 1])
+                ok = response.status_code == 302 and 'thank-you' in response.location
+                error = None if ok else f'HTTP {response.status_code} -> {response.location}'
+            except Exception as e:
+                ok, error = False, str(e).splitlines()[0]
+            return ok, time.perf_counter() - start, error
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            results = list(executor.map(submit, range(1, args.students + 1)))
+        elapsed = time.perf_counter() - start
+
+        with app.app_context():
+            stored = db.session.execute(text('SELECT COUNT(DISTINCT student_id) FROM feedback_response')).scalar()
+
+    latencies = sorted(r[1] * 1000 for r in results)
+    failures = [r[2] for r in results if not r[0]]
+    print(f'pragmas:        {"off" if args.no_pragmas else "on"}')
+    print(f'submissions:    {len(results)} with {args.threads} threads in {elapsed:.2f}s')
+    print(f'throughput:     {len(results) / elapsed:.1f} submissions/s')
+    print(f'latency (ms):   p50 {statistics.median(latencies):.1f}  '
+          f'p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f}  max {latencies[-1]:.1f}')
+    print(f'failures:       {len(failures)}  (stored submissions: {stored})')
+    for error in sorted(set(failures))[:5]:
+        print(f'  - {error}')
+
+if __name__ == '__main__':
+    main()
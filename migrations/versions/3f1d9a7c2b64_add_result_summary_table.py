@@ -0,0 +1,57 @@
+"""add result_summary table
+
+Revision ID: 3f1d9a7c2b64
+Revises: 8c5231a5f723
+Create Date: 2026-10-18 10:12:31.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1d9a7c2b64'
+down_revision = '8c5231a5f723'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_app() runs db.create_all() before migrations, so the table may already exist (empty or partly filled)
+    if not sa.inspect(op.get_bind()).has_table('result_summary'):
+        op.create_table('result_summary',
+            sa.Column('event_id', sa.Integer(), nullable=False),
+            sa.Column('course_id', sa.Integer(), nullable=False),
+            sa.Column('staff_id', sa.Integer(), nullable=False),
+            sa.Column('question_id', sa.Integer(), nullable=False),
+            sa.Column('response_count', sa.Integer(), nullable=False),
+            sa.Column('rating_sum', sa.Integer(), nullable=False),
+            sa.Column('rating_1_count', sa.Integer(), nullable=False),
+            sa.Column('rating_2_count', sa.Integer(), nullable=False),
+            sa.Column('rating_3_count', sa.Integer(), nullable=False),
+            sa.Column('rating_4_count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['event_id'], ['event.id'], ),
+            sa.ForeignKeyConstraint(['course_id'], ['course.id'], ),
+            sa.ForeignKeyConstraint(['staff_id'], ['staff.id'], ),
+            sa.ForeignKeyConstraint(['question_id'], ['question.id'], ),
+            sa.PrimaryKeyConstraint('event_id', 'course_id', 'staff_id', 'question_id')
+        )
+
+    # Backfill from existing responses, replacing anything recorded before the migration ran
+    op.execute("DELETE FROM result_summary")
+    op.execute("""
+        INSERT INTO result_summary (event_id, course_id, staff_id, question_id, response_count, rating_sum,
+                                    rating_1_count, rating_2_count, rating_3_count, rating_4_count)
+        SELECT fr.event_id, fr.course_id, fr.staff_id, qr.question_id, COUNT(qr.id), SUM(qr.rating),
+               SUM(CASE WHEN qr.rating = 1 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN qr.rating = 2 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN qr.rating = 3 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN qr.rating = 4 THEN 1 ELSE 0 END)
+        FROM question_response qr
+        JOIN feedback_response fr ON fr.id = qr.feedback_id
+        GROUP BY fr.event_id, fr.course_id, fr.staff_id, qr.question_id
+    """)
+
+
+def downgrade():
+    op.drop_table('result_summary')
@@ -0,0 +1,38 @@
+"""general feedback full-text search index
+
+Revision ID: a9c4e7d2b518
+Revises: e5b8a3f2c716
+Create Date: 2026-10-18 15:21:09.734166
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from utils.feedback_inbox import FTS_DDL, FTS_TABLE
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9c4e7d2b518'
+down_revision = 'e5b8a3f2c716'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other databases use substring search instead
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    # create_app() may already have built the index through ensure_feedback_search_index(); the DDL is IF NOT EXISTS
+    exists = sa.inspect(op.get_bind()).has_table(FTS_TABLE)
+    for statement in FTS_DDL:
+        op.execute(statement)
+    if not exists:
+        op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS general_feedback_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS general_feedback_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS general_feedback_fts_ai")
+    op.execute("DROP TABLE IF EXISTS general_feedback_fts")
@@ -0,0 +1,50 @@
+"""add indexes for feedback hot paths
+
+Revision ID: b7e2c4d91a05
+Revises: 3f1d9a7c2b64
+Create Date: 2026-10-18 11:03:47.209118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c4d91a05'
+down_revision = '3f1d9a7c2b64'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_feedback_response_event_student', 'feedback_response', ['event_id', 'student_id']),
+    ('ix_feedback_response_event_staff', 'feedback_response', ['event_id', 'staff_id']),
+    ('ix_feedback_response_student', 'feedback_response', ['student_id']),
+    ('ix_question_response_feedback_question', 'question_response', ['feedback_id', 'question_id']),
+    ('ix_general_feedback_category_timestamp', 'general_feedback', ['category', 'timestamp']),
+    ('ix_general_feedback_student_timestamp', 'general_feedback', ['student_id', 'timestamp']),
+    ('ix_event_is_active_is_deleted', 'event', ['is_active', 'is_deleted']),
+]
+
+
+def _existing_indexes():
+    # Tables created by db.create_all() may already carry these indexes (or not exist yet)
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    existing = {}
+    for table in tables:
+        existing[table] = {ix['name'] for ix in inspector.get_indexes(table)}
+    return existing
+
+
+def upgrade():
+    existing = _existing_indexes()
+    for name, table, columns in INDEXES:
+        if table in existing and name not in existing[table]:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    existing = _existing_indexes()
+    for name, table, columns in reversed(INDEXES):
+        if name in existing.get(table, set()):
+            op.drop_index(name, table_name=table)
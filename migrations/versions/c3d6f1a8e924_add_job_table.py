@@ -0,0 +1,46 @@
+"""add job table for background admin work
+
+Revision ID: c3d6f1a8e924
+Revises: a9c4e7d2b518
+Create Date: 2026-10-18 16:05:42.118530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d6f1a8e924'
+down_revision = 'a9c4e7d2b518'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_app() runs db.create_all() before migrations, so the table may already exist
+    if sa.inspect(op.get_bind()).has_table('job'):
+        return
+    op.create_table('job',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('result_path', sa.String(length=255), nullable=True),
+        sa.Column('result_name', sa.String(length=255), nullable=True),
+        sa.Column('result_mimetype', sa.String(length=100), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_job_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_job_created_at'))
+    op.drop_table('job')
@@ -0,0 +1,87 @@
+"""enforce one feedback response per student, event and course
+
+Revision ID: d41a8e6f0c37
+Revises: b7e2c4d91a05
+Create Date: 2026-10-18 11:47:05.663120
+
+"""
+import logging
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41a8e6f0c37'
+down_revision = 'b7e2c4d91a05'
+branch_labels = None
+depends_on = None
+
+
+log = logging.getLogger('alembic.runtime.migration')
+
+CONSTRAINT = 'uq_feedback_response_event_student_course'
+
+# Every response after the first (lowest id) one per (event, student, course)
+DUPLICATE_IDS = """
+    SELECT fr.id FROM feedback_response fr
+    WHERE fr.id > (SELECT MIN(k.id) FROM feedback_response k
+                   WHERE k.event_id = fr.event_id AND k.student_id = fr.student_id AND k.course_id = fr.course_id)
+"""
+
+REBUILD_SUMMARIES = """
+    INSERT INTO result_summary (event_id, course_id, staff_id, question_id, response_count, rating_sum,
+                                rating_1_count, rating_2_count, rating_3_count, rating_4_count)
+    SELECT fr.event_id, fr.course_id, fr.staff_id, qr.question_id, COUNT(qr.id), SUM(qr.rating),
+           SUM(CASE WHEN qr.rating = 1 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN qr.rating = 2 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN qr.rating = 3 THEN 1 ELSE 0 END),
+           SUM(CASE WHEN qr.rating = 4 THEN 1 ELSE 0 END)
+    FROM question_response qr
+    JOIN feedback_response fr ON fr.id = qr.feedback_id
+    GROUP BY fr.event_id, fr.course_id, fr.staff_id, qr.question_id
+"""
+
+
+def _index_names(table):
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def _remove_duplicate_responses():
+    """
+    Keep the earliest response per (event, student, course), which the old read-then-write submission
+    race could have doubled, and rebuild result_summary if anything was removed.
+    """
+    bind = op.get_bind()
+    groups = bind.execute(sa.text("""
+        SELECT event_id, student_id, course_id, MIN(id), COUNT(*) FROM feedback_response
+        GROUP BY event_id, student_id, course_id HAVING COUNT(*) > 1
+    """)).all()
+    if not groups:
+        return
+    log.warning('Removing %d duplicate feedback responses in %d (event, student, course) groups:',
+                sum(count - 1 for *_, count in groups), len(groups))
+    for event_id, student_id, course_id, kept_id, count in groups:
+        log.warning('  event %s, student %s, course %s: kept response %s, removed %d',
+                    event_id, student_id, course_id, kept_id, count - 1)
+    op.execute(f"DELETE FROM question_response WHERE feedback_id IN ({DUPLICATE_IDS})")
+    op.execute(f"DELETE FROM feedback_response WHERE id IN ({DUPLICATE_IDS})")
+    op.execute("DELETE FROM result_summary")
+    op.execute(REBUILD_SUMMARIES)
+
+
+def upgrade():
+    _remove_duplicate_responses()
+    # The unique constraint's index also serves (event_id, student_id) lookups
+    if 'ix_feedback_response_event_student' in _index_names('feedback_response'):
+        op.drop_index('ix_feedback_response_event_student', table_name='feedback_response')
+    # db.create_all() in create_app() may have created feedback_response with the constraint already
+    unique_names = {uc['name'] for uc in sa.inspect(op.get_bind()).get_unique_constraints('feedback_response')}
+    if CONSTRAINT not in unique_names:
+        with op.batch_alter_table('feedback_response', schema=None) as batch_op:
+            batch_op.create_unique_constraint(CONSTRAINT, ['event_id', 'student_id', 'course_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('feedback_response', schema=None) as batch_op:
+        batch_op.drop_constraint(CONSTRAINT, type_='unique')
+    op.create_index('ix_feedback_response_event_student', 'feedback_response', ['event_id', 'student_id'], unique=False)
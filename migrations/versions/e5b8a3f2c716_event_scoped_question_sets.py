@@ -0,0 +1,47 @@
+"""event-scoped question sets
+
+Revision ID: e5b8a3f2c716
+Revises: d41a8e6f0c37
+Create Date: 2026-10-18 14:02:48.215307
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8a3f2c716'
+down_revision = 'd41a8e6f0c37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_app() runs db.create_all() before migrations, which may already have created event_question
+    inspector = sa.inspect(op.get_bind())
+    if 'is_default' not in {column['name'] for column in inspector.get_columns('question')}:
+        with op.batch_alter_table('question', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('is_default', sa.Boolean(), nullable=True, server_default=sa.true()))
+
+    if not inspector.has_table('event_question'):
+        op.create_table('event_question',
+            sa.Column('event_id', sa.Integer(), nullable=False),
+            sa.Column('question_id', sa.Integer(), nullable=False),
+            sa.Column('position', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['event_id'], ['event.id'], ),
+            sa.ForeignKeyConstraint(['question_id'], ['question.id'], ),
+            sa.PrimaryKeyConstraint('event_id', 'question_id')
+        )
+
+    # Every question used to apply to every event, so events without a question set get the full set in id order
+    op.execute("""
+        INSERT INTO event_question (event_id, question_id, position)
+        SELECT e.id, q.id, q.id FROM event e CROSS JOIN question q
+        WHERE NOT EXISTS (SELECT 1 FROM event_question eq WHERE eq.event_id = e.id)
+    """)
+
+
+def downgrade():
+    op.drop_table('event_question')
+    with op.batch_alter_table('question', schema=None) as batch_op:
+        batch_op.drop_column('is_default')
@@ -0,0 +1,32 @@
+"""track the owning process and heartbeat of background jobs
+
+Revision ID: f7a2d9c4e1b3
+Revises: c3d6f1a8e924
+Create Date: 2026-10-18 17:12:26.504187
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7a2d9c4e1b3'
+down_revision = 'c3d6f1a8e924'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_app() runs db.create_all() before migrations, so a new job table already has the columns
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('job')}
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        if 'worker' not in columns:
+            batch_op.add_column(sa.Column('worker', sa.String(length=32), nullable=True))
+        if 'heartbeat_at' not in columns:
+            batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('job', schema=None) as batch_op:
+        batch_op.drop_column('heartbeat_at')
+        batch_op.drop_column('worker')
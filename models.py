@@ -28,6 +28,10 @@ class User(db.Model, UserMixin):
 
 # New General Feedback Model
 class GeneralFeedback(db.Model):
+    __table_args__ = (
+        db.Index('ix_general_feedback_category_timestamp', 'category', 'timestamp'),
+        db.Index('ix_general_feedback_student_timestamp', 'student_id', 'timestamp'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     category = db.Column(db.String(50), nullable=False)  # fc, library, transport, sports, bookdepot, general
     content = db.Column(db.Text, nullable=False)
@@ -57,26 +61,46 @@ class Student(db.Model):
     def __repr__(self):
         return f'<Student {self.roll_number}>'
 
+class SoftDeleteMixin:
+    """Adds an is_deleted flag plus a query helper that hides soft-deleted rows."""
+    is_deleted = db.Column(db.Boolean, default=False)
+
+    @classmethod
+    def not_deleted(cls):
+        return cls.query.filter_by(is_deleted=False)
+
 # Association table for Event <-> Course
 EventCourse = Table('event_course', db.Model.metadata,
     Column('event_id', Integer, ForeignKey('event.id'), primary_key=True),
     Column('course_id', Integer, ForeignKey('course.id'), primary_key=True)
 )
 
-class Event(db.Model):
+# Association table for Event <-> Question; position orders the questions on forms and reports
+EventQuestion = Table('event_question', db.Model.metadata,
+    Column('event_id', Integer, ForeignKey('event.id'), primary_key=True),
+    Column('question_id', Integer, ForeignKey('question.id'), primary_key=True),
+    Column('position', Integer, nullable=False)
+)
+
+class Event(SoftDeleteMixin, db.Model):
+    __table_args__ = (
+        db.Index('ix_event_is_active_is_deleted', 'is_active', 'is_deleted'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     warning_message = db.Column(db.Text, default='This feedback is for the specified class only.')
     is_active = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    is_deleted = db.Column(db.Boolean, default=False)   
     is_open_to_all = db.Column(db.Boolean, default=True)
     start_roll_number = db.Column(db.String(20), nullable=True)
     end_roll_number = db.Column(db.String(20), nullable=True)
     feedback_responses = db.relationship('FeedbackResponse', backref='event', lazy=True)
     # New: courses for this event
     courses = db.relationship('Course', secondary=EventCourse, backref='events')
+    # Ordered question set; rows are written by utils.event_questions.assign_event_questions
+    questions = db.relationship('Question', secondary=EventQuestion, order_by=EventQuestion.c.position,
+                                viewonly=True)
 
     def __repr__(self):
         return f'<Event {self.title}>'
@@ -103,12 +127,20 @@ class Staff(db.Model):
 class Question(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.Text, nullable=False)
+    # Default questions are attached to every new event; additional ones only to the event that added them
+    is_default = db.Column(db.Boolean, default=True)
     responses = db.relationship('QuestionResponse', backref='question', lazy=True)
 
     def __repr__(self):
         return f'<Question {self.id}: {self.text[:20]}...>'
 
 class FeedbackResponse(db.Model):
+    __table_args__ = (
+        # One response per course per student and event; also serves (event_id, student_id) lookups
+        db.UniqueConstraint('event_id', 'student_id', 'course_id', name='uq_feedback_response_event_student_course'),
+        db.Index('ix_feedback_response_event_staff', 'event_id', 'staff_id'),
+        db.Index('ix_feedback_response_student', 'student_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('student.id', ondelete='CASCADE'), nullable=False)
     event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
@@ -122,6 +154,9 @@ class FeedbackResponse(db.Model):
         return f'<FeedbackResponse {self.id}>'
 
 class QuestionResponse(db.Model):
+    __table_args__ = (
+        db.Index('ix_question_response_feedback_question', 'feedback_id', 'question_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     feedback_id = db.Column(db.Integer, db.ForeignKey('feedback_response.id'), nullable=False)
     question_id = db.Column(db.Integer, db.ForeignKey('question.id'), nullable=False)
@@ -129,3 +164,41 @@ class QuestionResponse(db.Model):
 
     def __repr__(self):
         return f'<QuestionResponse {self.id}: Rating {self.rating}>'
+
+class ResultSummary(db.Model):
+    """Running rating totals per (event, course, staff, question), kept in step with QuestionResponse inserts."""
+    __tablename__ = 'result_summary'
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), primary_key=True)
+    course_id = db.Column(db.Integer, db.ForeignKey('course.id'), primary_key=True)
+    staff_id = db.Column(db.Integer, db.ForeignKey('staff.id'), primary_key=True)
+    question_id = db.Column(db.Integer, db.ForeignKey('question.id'), primary_key=True)
+    response_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_1_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_2_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_3_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_4_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<ResultSummary e{self.event_id} s{self.staff_id} q{self.question_id}: {self.response_count}>'
+
+class Job(db.Model):
+    """Background admin job (imports, report bundles) run by utils.jobs; result files live under JOB_DIR."""
+    id = db.Column(db.String(32), primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed
+    progress = db.Column(db.Integer, nullable=False, default=0)  # 0 to 100
+    message = db.Column(db.Text, nullable=True)
+    result_path = db.Column(db.String(255), nullable=True)
+    result_name = db.Column(db.String(255), nullable=True)
+    result_mimetype = db.Column(db.String(100), nullable=True)
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    # Process that owns the job and the last time it reported being alive; stale queued/running jobs are failed
+    worker = db.Column(db.String(32), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<Job {self.kind} {self.id}: {self.status}>'
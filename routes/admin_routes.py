@@ -1,41 +1,33 @@
 import os
 import pandas as pd
-from io import BytesIO
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app, send_file
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app, send_file, Response, stream_with_context
 from flask_login import login_required, login_user, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-from sqlalchemy import func, inspect
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 from myextensions import db
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-import io
-import zipfile
 
-from models import User, Student, Event, Course, Staff, Question, FeedbackResponse, QuestionResponse
-from models import GeneralFeedback
-from utils.excel_handler import allowed_file, validate_student_excel, validate_course_staff_excel
-from utils.pdf_generator import generate_pdf_report
+from models import User, Student, Event, Course, Staff, Question, FeedbackResponse, EventQuestion
+from models import GeneralFeedback, Job
+from utils.excel_handler import allowed_file
+from utils.pdf_generator import report_filename
+from utils.report_cache import open_cached_report, clear_report_cache
+from utils.aggregation import staff_question_stats, event_comparison
+from utils.result_summary import rebuild_summaries
+from utils.roster import student_roster, non_responders, eligible_student_count, invalidate_eligible_counts
+from utils.active_event import get_active_event, invalidate_active_event
+from utils.event_questions import assign_event_questions
+from utils.jobs import enqueue_job, job_status, fail_orphaned_jobs
+import utils.admin_jobs  # registers the admin job handlers
+from utils.response_export import iter_export, EXPORT_FORMATS
+from utils.streaming import attachment_disposition
+from utils.staff_responses import staff_responses_page
+from utils.feedback_stats import feedback_stats, feedback_stats_from_args
+from utils.feedback_inbox import feedback_page, feedback_counts
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
-# Helper function: applies filter_by(is_deleted=False) if the table has an is_deleted column.
-def safe_filter(query_obj):
-    try:
-        # Get the entity (model) from the query.
-        entity = query_obj.column_descriptions[0]['entity']
-        # Use SQLAlchemy inspector to check column names.
-        inspector = inspect(db.engine)
-        columns = [col['name'] for col in inspector.get_columns(entity.__tablename__)]
-        if 'is_deleted' in columns:
-            return query_obj.filter_by(is_deleted=False)
-    except Exception:
-        # In case of any error, simply return the original query.
-        pass
-    return query_obj
-
 @admin_bp.route('/login', methods=['GET', 'POST'])
 def login():
     # Always require credentials, even if already authenticated
@@ -64,23 +56,22 @@ def dashboard():
     if not current_user.is_admin:
         flash('Access denied. You must be an admin to view this page.', 'danger')
         return redirect(url_for('admin.login'))
-    events = safe_filter(Event.query).all()
+    events = Event.not_deleted().all()
     total_students = Student.query.count()
     total_responses = FeedbackResponse.query.count()
     total_general_feedback = GeneralFeedback.query.count()
-    active_event = safe_filter(Event.query.filter_by(is_active=True)).first()
+    active_event = get_active_event()
     event_responses = 0
     completion_rate = 0
-    students = Student.query.order_by(Student.roll_number).all()
-    responded_ids = set([r[0] for r in db.session.query(FeedbackResponse.student_id).filter_by(event_id=active_event.id).distinct().all()]) if active_event else set()
-    if total_students > 0 and active_event:
+    eligible_students = eligible_student_count(active_event) if active_event else total_students
+    if eligible_students > 0 and active_event:
         event_responses = db.session.query(FeedbackResponse.student_id).filter_by(event_id=active_event.id).distinct().count()
-        completion_rate = (event_responses / total_students) * 100
+        completion_rate = (event_responses / eligible_students) * 100
     return render_template('admin/dashboard.html', events=events,
-                           total_students=total_students, total_responses=total_responses,
+                           total_students=total_students, eligible_students=eligible_students,
+                           total_responses=total_responses,
                            total_general_feedback=total_general_feedback,
-                           active_event=active_event, completion_rate=completion_rate, event_responses=event_responses,
-                           students=students, responded_ids=responded_ids)
+                           active_event=active_event, completion_rate=completion_rate, event_responses=event_responses)
 
 @admin_bp.route('/general-feedback')
 @login_required
@@ -90,17 +81,27 @@ def general_feedback():
         return redirect(url_for('admin.login'))
     
     category_filter = request.args.get('category', 'all')
+    status_filter = request.args.get('status', 'all')
+    search = request.args.get('q', '').strip()
     
-    if category_filter == 'all':
-        feedbacks = GeneralFeedback.query.order_by(GeneralFeedback.timestamp.desc()).all()
-    else:
-        feedbacks = GeneralFeedback.query.filter_by(category=category_filter).order_by(GeneralFeedback.timestamp.desc()).all()
+    # One page at a time, newest first; ?before= is the cursor of the previous page
+    try:
+        page = feedback_page(category=None if category_filter == 'all' else category_filter,
+                             status=status_filter, search=search or None,
+                             before=request.args.get('before'))
+    except ValueError:
+        return redirect(url_for('admin.general_feedback', category=category_filter, status=status_filter, q=search))
     
     # Get category statistics
-    category_stats = {}
     categories = ['fc', 'library', 'transport', 'sports', 'bookdepot', 'general']
-    for cat in categories:
-        category_stats[cat] = GeneralFeedback.query.filter_by(category=cat).count()
+    totals = feedback_stats()['category_totals']
+    category_stats = {cat: totals.get(cat, 0) for cat in categories}
+    if status_filter != 'all' or search:
+        # The heading counts the listed feedback, so it takes the same filters as the page
+        total_feedbacks = feedback_counts(None if category_filter == 'all' else category_filter,
+                                          status=status_filter, search=search)['total']
+    else:
+        total_feedbacks = sum(category_stats.values()) if category_filter == 'all' else category_stats.get(category_filter, 0)
     
     category_names = {
         'fc': 'Food Court',
@@ -112,8 +113,12 @@ def general_feedback():
     }
     
     return render_template('admin/general_feedback.html', 
-                         feedbacks=feedbacks,
+                         feedbacks=page['feedbacks'],
+                         next_cursor=page['next_cursor'],
+                         total_feedbacks=total_feedbacks,
                          category_filter=category_filter,
+                         status_filter=status_filter,
+                         search=search,
                          category_stats=category_stats,
                          category_names=category_names)
 
@@ -140,35 +145,17 @@ def general_feedback_stats():
     if not current_user.is_admin:
         return jsonify({'error': 'Access denied'}), 403
     
-    # Get monthly feedback counts for the last 6 months
-    from datetime import datetime, timedelta
-    monthly_data = []
-    category_data = {}
-    
+    # Bucketed counts (?granularity=day|week|month, ?periods=, ?end=) from one grouped, cached query
+    try:
+        stats = feedback_stats_from_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     categories = ['fc', 'library', 'transport', 'sports', 'bookdepot', 'general']
-    
-    for i in range(6):
-        start_date = datetime.utcnow().replace(day=1) - timedelta(days=30*i)
-        end_date = start_date.replace(day=28) + timedelta(days=4)
-        end_date = end_date - timedelta(days=end_date.day)
-        
-        total_count = GeneralFeedback.query.filter(
-            GeneralFeedback.timestamp >= start_date,
-            GeneralFeedback.timestamp <= end_date
-        ).count()
-        
-        monthly_data.append({
-            'month': start_date.strftime('%b %Y'),
-            'count': total_count
-        })
-    
-    # Get category-wise data
-    for cat in categories:
-        category_data[cat] = GeneralFeedback.query.filter_by(category=cat).count()
-    
     return jsonify({
-        'monthly_data': list(reversed(monthly_data)),
-        'category_data': category_data
+        'granularity': stats['granularity'],
+        'series': stats['series'],
+        'monthly_data': [{'month': b['label'], 'count': b['count']} for b in stats['series']],
+        'category_data': {cat: stats['category_totals'].get(cat, 0) for cat in categories}
     })
 
 @admin_bp.route('/events', methods=['GET', 'POST'])
@@ -206,15 +193,12 @@ def manage_events():
             if course_ids:
                 event.courses = Course.query.filter(Course.id.in_(course_ids)).all()
             db.session.add(event)
+            db.session.flush()
+            questions_list = [q.strip() for q in (additional_questions or '').splitlines() if q.strip()]
+            assign_event_questions(event.id, questions_list)
             db.session.commit()
             flash('Event created successfully', 'success')
-            if additional_questions:
-                questions_list = [q.strip() for q in additional_questions.splitlines() if q.strip()]
-                for q_text in questions_list:
-                    existing = Question.query.filter_by(text=q_text).first()
-                    if not existing:
-                        db.session.add(Question(text=q_text))
-                db.session.commit()
+            if questions_list:
                 flash(f"Added {len(questions_list)} additional question(s).", "success")
         elif action == 'toggle':
             event_id = request.form.get('event_id')
@@ -230,9 +214,10 @@ def manage_events():
             event.is_deleted = True
             db.session.commit()
             flash('Event was moved to Past Responses.', 'success')
-    events = safe_filter(Event.query).all()
+        invalidate_active_event()
+    events = Event.not_deleted().all()
     courses = Course.query.all()
-    questions = Question.query.all()
+    questions = Question.query.order_by(Question.id).all()
     return render_template('admin/manage_events.html', events=events, questions=questions, courses=courses)
 
 @admin_bp.route('/delete_question/<int:question_id>', methods=['POST'])
@@ -242,8 +227,10 @@ def delete_question(question_id):
     if q.responses:
         flash("Cannot delete question with existing responses.", "danger")
     else:
+        db.session.execute(EventQuestion.delete().where(EventQuestion.c.question_id == q.id))
         db.session.delete(q)
         db.session.commit()
+        invalidate_active_event()
         flash("Question deleted successfully.", "success")
     return redirect(url_for('admin.manage_events'))
 
@@ -254,10 +241,14 @@ def past_responses():
         flash('Access denied.', 'danger')
         return redirect(url_for('admin.login'))
     try:
-        past_events = Event.query.filter_by(is_deleted=True).all()
+        past_events = Event.query.filter_by(is_deleted=True)\
+                                 .options(selectinload(Event.courses).selectinload(Course.staffs)).all()
+        response_counts = dict(db.session.query(FeedbackResponse.event_id, func.count(FeedbackResponse.id))
+                                 .filter(FeedbackResponse.event_id.in_([e.id for e in past_events]))
+                                 .group_by(FeedbackResponse.event_id).all())
     except Exception:
-        past_events = []
-    return render_template('admin/past_responses.html', past_events=past_events)
+        past_events, response_counts = [], {}
+    return render_template('admin/past_responses.html', past_events=past_events, response_counts=response_counts)
 
 @admin_bp.route('/courses', methods=['GET', 'POST'])
 @login_required
@@ -322,31 +313,13 @@ def manage_courses():
                 flash('No selected file', 'danger')
                 return redirect(request.url)
             if file and allowed_file(file.filename):
-                try:
-                    success, message, data = validate_course_staff_excel(file)
-                    if not success:
-                        flash(message, 'danger')
-                        return redirect(request.url)
-                    added_courses = 0
-                    added_staff = 0
-                    for course_code, course_name, teacher_name in data:
-                        course = Course.query.filter_by(code=course_code, name=course_name).first()
-                        if not course:
-                            course = Course(code=course_code, name=course_name)
-                            db.session.add(course)
-                            db.session.commit()
-                            added_courses += 1
-                        staff = Staff.query.filter_by(name=teacher_name, course_id=course.id).first()
-                        if not staff:
-                            staff = Staff(name=teacher_name, course_id=course.id)
-                            db.session.add(staff)
-                            db.session.commit()
-                            added_staff += 1
-                    flash(f"{message}. Added {added_courses} new courses and {added_staff} new staff.", 'success')
-                except Exception as e:
-                    flash(f'Error processing file: {str(e)}', 'danger')
+                # Imports run in the background job pool; the job page polls for the result
+                job = enqueue_job('import_courses', {'batch_size': current_app.config.get('IMPORT_BATCH_SIZE', 500)},
+                                  upload=file, user_id=current_user.id)
+                return redirect(url_for('admin.job_page', job_id=job.id))
             else:
                 flash('Invalid file type. Please upload an Excel file (.xls, .xlsx)', 'danger')
+        invalidate_active_event()
     courses = Course.query.all()
     return render_template('admin/manage_courses.html', courses=courses)
 
@@ -367,28 +340,9 @@ def manage_students():
                 flash('No selected file', 'danger')
                 return redirect(request.url)
             if file and allowed_file(file.filename):
-                try:
-                    success, message, students_data = validate_student_excel(file)
-                    if not success:
-                        flash(message, 'danger')
-                        return redirect(request.url)
-                    for roll_number, name, email in students_data:
-                        existing_student = Student.query.filter_by(roll_number=roll_number).first()
-                        if existing_student:
-                            existing_student.name = name
-                            existing_student.email = email
-                        else:
-                            new_student = Student(
-                                roll_number=roll_number,
-                                name=name,
-                                email=email,
-                                password_hash=generate_password_hash('Srec@123')
-                            )
-                            db.session.add(new_student)
-                    db.session.commit()
-                    flash(f'Successfully processed {len(students_data)} students', 'success')
-                except Exception as e:
-                    flash(f'Error processing file: {str(e)}', 'danger')
+                # Imports run in the background job pool; the job page polls for the result
+                job = enqueue_job('import_students', upload=file, user_id=current_user.id)
+                return redirect(url_for('admin.job_page', job_id=job.id))
         elif action == 'add_student':
             roll_number = request.form.get('roll_number')
             name = request.form.get('name')
@@ -422,9 +376,13 @@ def manage_students():
                 db.session.delete(s)
                 count_deleted += 1
             db.session.commit()
+            # Deleting students cascades to their responses, so the result summaries must be recomputed
+            rebuild_summaries()
+            clear_report_cache()
             flash(f"Deleted {count_deleted} students.", "success")
-    students = Student.query.all()
-    return render_template('admin/manage_students.html', students=students)
+        invalidate_eligible_counts()
+    total_students = Student.query.count()
+    return render_template('admin/manage_students.html', total_students=total_students)
 
 @admin_bp.route('/results')
 @login_required
@@ -432,18 +390,31 @@ def results():
     if not current_user.is_admin:
         flash('Access denied.', 'danger')
         return redirect(url_for('admin.login'))
-    try:
-        active_event = Event.query.filter_by(is_active=True, is_deleted=False).first()
-    except Exception:
-        active_event = Event.query.filter_by(is_active=True).first()
+    active_event = get_active_event()
     courses = Course.query.all()
     staffs = Staff.query.all()
-    questions = Question.query.all()
-    students = Student.query.order_by(Student.roll_number).all()
-    responded_ids = set([r[0] for r in db.session.query(FeedbackResponse.student_id).filter_by(event_id=active_event.id).distinct().all()]) if active_event else set()
+    questions = active_event.questions if active_event else []
     return render_template('admin/results.html', active_event=active_event,
-                           courses=courses, staffs=staffs, questions=questions,
-                           students=students, responded_ids=responded_ids)
+                           courses=courses, staffs=staffs, questions=questions)
+
+@admin_bp.route('/api/students')
+@login_required
+def api_students():
+    if not current_user.is_admin:
+        return jsonify({'error': 'Access denied'}), 403
+    event_id = request.args.get('event_id', type=int)
+    if not event_id:
+        active_event = get_active_event()
+        event_id = active_event.id if active_event else None
+    roster = student_roster(event_id=event_id,
+                            after=request.args.get('after'),
+                            limit=request.args.get('limit', 50, type=int),
+                            status=request.args.get('status', 'all'),
+                            roll_from=request.args.get('roll_from'),
+                            roll_to=request.args.get('roll_to'),
+                            search=request.args.get('q'))
+    roster['event_id'] = event_id
+    return jsonify(roster)
 
 @admin_bp.route('/api/results/staff/<int:staff_id>')
 @login_required
@@ -453,47 +424,60 @@ def get_staff_results(staff_id):
     staff = Staff.query.get_or_404(staff_id)
     event_id = request.args.get('event_id')
     if not event_id:
-        try:
-            active_event = Event.query.filter_by(is_active=True, is_deleted=False).first()
-        except Exception:
-            active_event = Event.query.filter_by(is_active=True).first()
-        if active_event:
-            event_id = active_event.id
+        event = get_active_event()
+        if event:
+            event_id = event.id
         else:
             return jsonify({'error': 'No active event found'}), 404
-    feedback_responses = FeedbackResponse.query.filter_by(staff_id=staff_id, event_id=event_id).all()
-    question_averages = {}
-    questions = Question.query.all()
-    for q in questions:
-        ratings = []
-        for feedback in feedback_responses:
-            resp = QuestionResponse.query.filter_by(feedback_id=feedback.id, question_id=q.id).first()
-            if resp:
-                ratings.append(resp.rating)
-        if ratings:
-            avg = sum(ratings) / len(ratings)
-            question_averages[q.id] = {'question_text': q.text, 'average': round(avg, 2), 'count': len(ratings)}
-        else:
-            question_averages[q.id] = {'question_text': q.text, 'average': 0, 'count': 0}
+    else:
+        event = Event.query.get_or_404(event_id)
+    # A list rather than a dict keyed by question id, so the event's question order survives JSON
+    question_averages = [{'question_id': stat['question'].id, 'question_text': stat['question'].text,
+                          'average': stat['average'], 'count': stat['count']}
+                         for stat in staff_question_stats(staff_id, event_id)]
     responded_students = db.session.query(Student.id).join(FeedbackResponse, Student.id == FeedbackResponse.student_id)\
                          .filter(FeedbackResponse.staff_id == staff_id, FeedbackResponse.event_id == event_id)\
                          .distinct().count()
-    total_students = Student.query.count()
-    responded_student_ids = db.session.query(FeedbackResponse.student_id)\
-                               .filter_by(event_id=event_id, staff_id=staff_id).distinct().all()
-    responded_ids = [rid[0] for rid in responded_student_ids]
-    non_responder_students = Student.query.filter(~Student.id.in_(responded_ids)).all()
-    non_responders = [{'roll_number': s.roll_number, 'name': s.name} for s in non_responder_students]
+    total_students = eligible_student_count(event)
+    # Eligible students who have not responded for this staff; ?non_responders=count skips the list
+    if request.args.get('non_responders') == 'count':
+        pending = {'students': [], 'next_cursor': None,
+                   'count': non_responders(event, staff_id=staff_id, count_only=True)}
+    else:
+        pending = non_responders(event, staff_id=staff_id,
+                                 after=request.args.get('non_responders_after'),
+                                 limit=request.args.get('non_responders_limit', 100, type=int))
     return jsonify({
         'staff_name': staff.name,
         'course_name': staff.course.name,
         'question_averages': question_averages,
         'responded_count': responded_students,
         'total_students': total_students,
-        'non_responders': non_responders,
+        'non_responders': pending['students'],
+        'non_responders_count': pending['count'],
+        'non_responders_next_cursor': pending['next_cursor'],
         'response_percentage': round((responded_students / total_students * 100), 2) if total_students > 0 else 0
     })
 
+@admin_bp.route('/api/results/compare')
+@login_required
+def compare_results():
+    if not current_user.is_admin:
+        return jsonify({'error': 'Access denied'}), 403
+    # ?staff_id= or ?course_id=, plus either ?events=N (most recent) or ?event_ids=1,2,3
+    event_ids = request.args.get('event_ids')
+    try:
+        if event_ids:
+            event_ids = [int(event_id) for event_id in event_ids.split(',') if event_id]
+        comparison = event_comparison(staff_id=request.args.get('staff_id', type=int),
+                                      course_id=request.args.get('course_id', type=int),
+                                      event_ids=event_ids or None,
+                                      limit=request.args.get('events', len(event_ids) if event_ids else 10,
+                                                             type=int))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(comparison)
+
 @admin_bp.route('/download_report/<int:staff_id>')
 @login_required
 def download_report(staff_id):
@@ -502,21 +486,18 @@ def download_report(staff_id):
         return redirect(url_for('admin.login'))
     event_id = request.args.get('event_id')
     if not event_id:
-        try:
-            active_event = Event.query.filter_by(is_active=True, is_deleted=False).first()
-        except Exception:
-            active_event = Event.query.filter_by(is_active=True).first()
+        active_event = get_active_event()
         if active_event:
             event_id = active_event.id
         else:
             flash('No active event found', 'danger')
             return redirect(url_for('admin.results'))
-    pdf_buffer = generate_pdf_report(staff_id, event_id)
     staff = Staff.query.get_or_404(staff_id)
     event = Event.query.get_or_404(event_id)
-    filename = f"report_{staff.course.code}_{staff.name.replace(' ', '_')}_{event.title.replace(' ', '_')}.pdf"
-    return send_file(BytesIO(pdf_buffer.getvalue()), mimetype='application/pdf',
-                     as_attachment=True, download_name=filename)
+    # Rendered PDFs are cached on disk by report content; past events are served straight from the cache
+    report_file = open_cached_report(staff, event)
+    filename = report_filename(staff.course.code, staff.name, event.title)
+    return send_file(report_file, mimetype='application/pdf', as_attachment=True, download_name=filename)
 
 @admin_bp.route('/download_student_responses_pdf')
 @login_required
@@ -524,38 +505,11 @@ def download_student_responses_pdf():
     if not current_user.is_admin:
         flash('Access denied.', 'danger')
         return redirect(url_for('admin.dashboard'))
-    try:
-        active_event = Event.query.filter_by(is_active=True, is_deleted=False).first()
-    except Exception:
-        active_event = Event.query.filter_by(is_active=True).first()
-    students = Student.query.order_by(Student.roll_number).all()
-    responded_ids = set([r[0] for r in db.session.query(FeedbackResponse.student_id).filter_by(event_id=active_event.id).distinct().all()]) if active_event else set()
-    # Prepare data for PDF
-    data = [['S.No', 'Roll Number', 'Name', 'Response']]
-    for idx, student in enumerate(students, 1):
-        response = 'Yes' if student.id in responded_ids else 'No'
-        data.append([str(idx), student.roll_number, student.name, response])
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=landscape(letter))
-    style = getSampleStyleSheet()["Normal"]
-    table = Table(data, repeatRows=1)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#007bff')),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,0), 12),
-        ('FONTSIZE', (0,1), (-1,-1), 10),
-        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.whitesmoke, colors.lightgrey]),
-        ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
-    ]))
-    event_title = active_event.title if active_event else 'No Event'
-    event_date = active_event.created_at.strftime('%Y-%m-%d') if active_event and active_event.created_at else ''
-    pdf_title = f'Student Response Status - {event_title} ({event_date})'
-    elements = [Paragraph(pdf_title, style), table]
-    doc.build(elements)
-    buffer.seek(0)
-    return send_file(buffer, mimetype='application/pdf', as_attachment=True, download_name='student_responses.pdf')
+    active_event = get_active_event()
+    job = enqueue_job('student_responses_pdf', {'event_id': active_event.id if active_event else None,
+                                                'eligible_only': request.args.get('eligible_only') == '1'},
+                      user_id=current_user.id)
+    return redirect(url_for('admin.job_page', job_id=job.id))
 
 @admin_bp.route('/download_all_reports')
 @login_required
@@ -564,46 +518,102 @@ def download_all_reports():
         flash('Access denied.', 'danger')
         return redirect(url_for('admin.login'))
     # Get all staff for the active event
-    try:
-        active_event = Event.query.filter_by(is_active=True, is_deleted=False).first()
-    except Exception:
-        active_event = Event.query.filter_by(is_active=True).first()
+    active_event = get_active_event()
     if not active_event:
         flash('No active event found.', 'danger')
         return redirect(url_for('admin.results'))
-    staffs = Staff.query.all()
-    # Create a zip of PDFs
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w') as zipf:
-        for staff in staffs:
-            pdf_buffer = generate_pdf_report(staff.id, event_id=active_event.id)
-            pdf_buffer.seek(0)
-            filename = f"report_{staff.course.code}_{staff.name.replace(' ', '_')}_{active_event.title.replace(' ', '_')}.pdf"
-            zipf.writestr(filename, pdf_buffer.read())
-    zip_buffer.seek(0)
-    return send_file(zip_buffer, mimetype='application/zip', as_attachment=True, download_name='all_staff_reports.zip')
+    # Rendered in the background job pool (PDFs across REPORT_WORKERS processes); the job page offers the zip
+    job = enqueue_job('event_reports_zip', {'event_id': active_event.id,
+                                            'max_workers': current_app.config.get('REPORT_WORKERS')},
+                      user_id=current_user.id)
+    return redirect(url_for('admin.job_page', job_id=job.id))
+
+@admin_bp.route('/jobs/<job_id>')
+@login_required
+def job_page(job_id):
+    if not current_user.is_admin:
+        flash('Access denied.', 'danger')
+        return redirect(url_for('admin.login'))
+    fail_orphaned_jobs()
+    job = Job.query.get_or_404(job_id)
+    return render_template('admin/job_status.html', job=job, status=job_status(job))
+
+@admin_bp.route('/api/jobs/<job_id>')
+@login_required
+def api_job_status(job_id):
+    if not current_user.is_admin:
+        return jsonify({'error': 'Access denied'}), 403
+    fail_orphaned_jobs()
+    return jsonify(job_status(Job.query.get_or_404(job_id)))
+
+@admin_bp.route('/jobs/<job_id>/download')
+@login_required
+def download_job_result(job_id):
+    if not current_user.is_admin:
+        flash('Access denied.', 'danger')
+        return redirect(url_for('admin.login'))
+    job = Job.query.get_or_404(job_id)
+    if job.status != 'succeeded' or not job.result_path or not os.path.exists(job.result_path):
+        flash('This job has no file to download.', 'warning')
+        return redirect(url_for('admin.job_page', job_id=job.id))
+    return send_file(job.result_path, mimetype=job.result_mimetype, as_attachment=True,
+                     download_name=job.result_name)
+
+@admin_bp.route('/export/responses')
+@login_required
+def export_responses():
+    if not current_user.is_admin:
+        return jsonify({'error': 'Access denied'}), 403
+    event_id = request.args.get('event_id', type=int)
+    if event_id:
+        event = Event.query.get_or_404(event_id)
+    else:
+        event = get_active_event()
+        if not event:
+            return jsonify({'error': 'No active event found'}), 404
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unknown format '{fmt}'"}), 400
+    try:
+        stream = iter_export(event.id, fmt, chunk_size=current_app.config.get('EXPORT_CHUNK_SIZE', 5000))
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 501
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/vnd.apache.parquet'
+    filename = f"responses_{event.title.replace(' ', '_')}.{fmt}"
+    return Response(stream_with_context(stream), mimetype=mimetype,
+                    headers={'Content-Disposition': attachment_disposition(filename)})
 
 @admin_bp.route('/api/responses/<int:staff_id>')
 @login_required
 def api_responses(staff_id):
     if not current_user.is_admin:
         return jsonify({'error': 'Access denied'}), 403
-    staff = Staff.query.get_or_404(staff_id)
-    try:
-        active_event = Event.query.filter_by(is_active=True, is_deleted=False).first()
-    except Exception:
-        active_event = Event.query.filter_by(is_active=True).first()
-    if not active_event:
-        return jsonify({'error': 'No active event found'}), 404
-    feedbacks = FeedbackResponse.query.filter_by(staff_id=staff_id, event_id=active_event.id).all()
+    Staff.query.get_or_404(staff_id)
+    event_id = request.args.get('event_id', type=int)
+    if not event_id:
+        active_event = get_active_event()
+        if not active_event:
+            return jsonify({'error': 'No active event found'}), 404
+        event_id = active_event.id
+    page = staff_responses_page(staff_id, event_id,
+                                after=request.args.get('after', type=int),
+                                limit=request.args.get('limit', 100, type=int))
+    questions = page['questions']
+    # ?format=compact returns one rating vector per student, aligned with the questions list
+    if request.args.get('format') == 'compact':
+        return jsonify({
+            'event_id': event_id,
+            'questions': [{'id': q.id, 'text': q.text} for q in questions],
+            'responses': [{'student_name': r['student_name'], 'roll_number': r['roll_number'],
+                           'ratings': [r['ratings'].get(q.id) for q in questions]}
+                          for r in page['responses']],
+            'next_cursor': page['next_cursor'],
+        })
     responses = []
-    for fb in feedbacks:
-        student = Student.query.get(fb.student_id)
-        # Collect all question responses as a string
-        q_resps = QuestionResponse.query.filter_by(feedback_id=fb.id).all()
-        resp_text = '; '.join([f"{qr.question.text}: {qr.rating}" for qr in q_resps])
-        responses.append({'student_name': student.name, 'response': resp_text})
-    return jsonify({'responses': responses})
+    for r in page['responses']:
+        resp_text = '; '.join(f"{q.text}: {r['ratings'][q.id]}" for q in questions if q.id in r['ratings'])
+        responses.append({'student_name': r['student_name'], 'response': resp_text})
+    return jsonify({'responses': responses, 'next_cursor': page['next_cursor']})
 
 # Route to force logout (for use when leaving admin area)
 @admin_bp.route('/force_logout')
@@ -3,7 +3,8 @@ from flask_login import login_required, login_user, logout_user, current_user
 from werkzeug.security import check_password_hash
 from myextensions import db
 from models import User, GeneralFeedback, Student
-from datetime import datetime, timedelta
+from utils.feedback_stats import feedback_stats_from_args
+from utils.feedback_inbox import feedback_page, feedback_counts
 
 incharge_bp = Blueprint('incharge', __name__, url_prefix='/incharge')
 
@@ -53,15 +54,18 @@ def dashboard():
     
     category = current_user.incharge_category
     
-    # Get feedback for this category
-    feedbacks = GeneralFeedback.query.filter_by(category=category).order_by(GeneralFeedback.timestamp.desc()).all()
+    status_filter = request.args.get('status', 'all')
+    search = request.args.get('q', '').strip()
+    
+    # Get one page of feedback for this category; ?before= is the cursor of the previous page
+    try:
+        page = feedback_page(category=category, status=status_filter, search=search or None,
+                             before=request.args.get('before'))
+    except ValueError:
+        return redirect(url_for('incharge.dashboard', status=status_filter, q=search))
     
     # Statistics
-    total_feedbacks = len(feedbacks)
-    recent_feedbacks = GeneralFeedback.query.filter_by(category=category).filter(
-        GeneralFeedback.timestamp >= datetime.utcnow() - timedelta(days=7)
-    ).count()
-    resolved_feedbacks = GeneralFeedback.query.filter_by(category=category, is_resolved=True).count()
+    counts = feedback_counts(category)
     
     category_names = {
         'fc': 'Food Court',
@@ -72,12 +76,15 @@ def dashboard():
     }
     
     return render_template('incharge/dashboard.html', 
-                         feedbacks=feedbacks,
+                         feedbacks=page['feedbacks'],
+                         next_cursor=page['next_cursor'],
+                         status_filter=status_filter,
+                         search=search,
                          category=category,
                          category_name=category_names.get(category, category.title()),
-                         total_feedbacks=total_feedbacks,
-                         recent_feedbacks=recent_feedbacks,
-                         resolved_feedbacks=resolved_feedbacks)
+                         total_feedbacks=counts['total'],
+                         recent_feedbacks=counts['recent'],
+                         resolved_feedbacks=counts['resolved'])
 
 @incharge_bp.route('/feedback/<int:feedback_id>/resolve', methods=['POST'])
 @login_required
@@ -109,21 +116,13 @@ def feedback_stats():
     
     category = current_user.incharge_category
     
-    # Get monthly feedback counts for the last 6 months
-    monthly_data = []
-    for i in range(6):
-        start_date = datetime.utcnow().replace(day=1) - timedelta(days=30*i)
-        end_date = start_date.replace(day=28) + timedelta(days=4)
-        end_date = end_date - timedelta(days=end_date.day)
-        
-        count = GeneralFeedback.query.filter_by(category=category).filter(
-            GeneralFeedback.timestamp >= start_date,
-            GeneralFeedback.timestamp <= end_date
-        ).count()
-        
-        monthly_data.append({
-            'month': start_date.strftime('%b %Y'),
-            'count': count
-        })
-    
-    return jsonify({'monthly_data': list(reversed(monthly_data))})
\ No newline at end of file
+    # Bucketed counts (?granularity=day|week|month, ?periods=, ?end=) from one grouped, cached query
+    try:
+        stats = feedback_stats_from_args(request.args, category=category)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({
+        'granularity': stats['granularity'],
+        'series': stats['series'],
+        'monthly_data': [{'month': b['label'], 'count': b['count']} for b in stats['series']]
+    })
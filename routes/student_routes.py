@@ -1,7 +1,11 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
 from werkzeug.security import check_password_hash, generate_password_hash
 from myextensions import db
-from models import Student, Event, FeedbackResponse, Course, Staff, Question, QuestionResponse, GeneralFeedback
+from models import Student, FeedbackResponse, GeneralFeedback
+from utils.feedback_submission import save_submission
+from utils.active_event import get_active_event, get_active_event_form, is_event_open, invalidate_active_event
+from utils.feedback_stats import invalidate_feedback_stats
+from utils.student_activity import student_activity
 
 student_bp = Blueprint('student', __name__, url_prefix='/student')
 
@@ -34,10 +38,7 @@ def dashboard():
     if not student_id:
         return redirect(url_for('student.login'))
     student = Student.query.get_or_404(student_id)
-    try:
-        active_event = Event.query.filter_by(is_active=True, is_deleted=False).first()
-    except Exception:
-        active_event = Event.query.filter_by(is_active=True).first()
+    active_event = get_active_event()
     # Restrict event access by roll number
     event_blocked = False
     warning_message = None
@@ -75,6 +76,22 @@ def general_feedback_dashboard():
                          student=student,
                          feedback_history=feedback_history)
 
+@student_bp.route('/api/activity')
+def api_activity():
+    student_id = session.get('student_id')
+    if not student_id:
+        return jsonify({'error': 'Not logged in'}), 401
+    student = Student.query.get_or_404(student_id)
+    # Submission status plus one page of general-feedback history; ?before= pages further back
+    try:
+        activity = student_activity(student, active_event=get_active_event(),
+                                    before=request.args.get('before'),
+                                    limit=request.args.get('limit', 10, type=int))
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    activity['student'] = {'roll_number': student.roll_number, 'name': student.name}
+    return jsonify(activity)
+
 @student_bp.route('/submit-feedback/<category>', methods=['GET', 'POST'])
 def submit_feedback(category):
     student_id = session.get('student_id')
@@ -113,6 +130,7 @@ def submit_feedback(category):
         )
         db.session.add(feedback)
         db.session.commit()
+        invalidate_feedback_stats()
         
         flash('Your feedback has been submitted successfully!', 'success')
         return redirect(url_for('student.general_feedback_dashboard'))
@@ -128,10 +146,7 @@ def feedback_form():
     if not student_id:
         return redirect(url_for('student.login'))
     student = Student.query.get_or_404(student_id)
-    try:
-        active_event = Event.query.filter_by(is_active=True, is_deleted=False).first()
-    except Exception:
-        active_event = Event.query.filter_by(is_active=True).first()
+    active_event, form_body = get_active_event_form()
     # Restrict event access by roll number
     if active_event and not active_event.is_open_to_all:
         if not (active_event.start_roll_number and active_event.end_roll_number):
@@ -148,8 +163,13 @@ def feedback_form():
         flash('You have already submitted feedback for this event', 'warning')
         return redirect(url_for('student.dashboard'))
     if request.method == 'POST':
+        if not is_event_open(active_event.id):
+            invalidate_active_event()
+            flash('This feedback event has been closed', 'warning')
+            return redirect(url_for('student.dashboard'))
         courses_data = {}
         courses = active_event.courses
+        question_ids = {q.id for q in active_event.questions}
         for course in courses:
             staff_selected = request.form.get(f"staff_{course.id}")
             if staff_selected:
@@ -162,35 +182,17 @@ def feedback_form():
                     staff_id = list(courses_data.get(course_id, {}).keys())[0] if course_id in courses_data else None
                     question_id = int(parts[3])
                     rating = int(value)
-                    if course_id in courses_data and staff_id:
+                    if course_id in courses_data and staff_id and question_id in question_ids:
                         courses_data[course_id][staff_id][question_id] = rating
-        for course_id, staffs in courses_data.items():
-            for staff_id, questions in staffs.items():
-                feedback = FeedbackResponse(student_id=student_id,
-                                            event_id=active_event.id,
-                                            course_id=course_id,
-                                            staff_id=staff_id)
-                db.session.add(feedback)
-                db.session.flush()
-                for question_id, rating in questions.items():
-                    qr = QuestionResponse(feedback_id=feedback.id,
-                                          question_id=question_id,
-                                          rating=rating)
-                    db.session.add(qr)
-        db.session.commit()
+        if not save_submission(student_id, active_event.id, courses_data):
+            flash('You have already submitted feedback for this event', 'warning')
+            return redirect(url_for('student.dashboard'))
         flash('Feedback submitted successfully', 'success')
         return redirect(url_for('student.thank_you'))
-    courses = active_event.courses
-    questions = Question.query.all()
-    course_staffs = {}
-    for course in courses:
-        course_staffs[course.id] = Staff.query.filter_by(course_id=course.id).all()
     return render_template('student/feedback_form.html',
                            student=student,
                            event=active_event,
-                           courses=courses,
-                           questions=questions,
-                           course_staffs=course_staffs)
+                           form_body=form_body)
 
 @student_bp.route('/thank-you')
 def thank_you():
@@ -0,0 +1,56 @@
+// Keyset-paginated student roster backed by /admin/api/students.
+// options: tbody, renderRow(student, index) -> <tr>, and optional loadMoreBtn, statusSelect,
+// searchInput, countsEl, pageSize.
+function initStudentRoster(options) {
+  let cursor = null;
+  let index = 0;
+  let loading = false;
+  let searchTimer = null;
+
+  function cell(content) {
+    const td = document.createElement('td');
+    if (content instanceof Node) td.appendChild(content); else td.textContent = content;
+    return td;
+  }
+
+  function load(reset) {
+    if (loading) return;
+    loading = true;
+    if (reset) {
+      cursor = null;
+      index = 0;
+      options.tbody.innerHTML = '';
+    }
+    const params = new URLSearchParams({limit: options.pageSize || 50});
+    if (cursor) params.set('after', cursor);
+    if (options.statusSelect) params.set('status', options.statusSelect.value);
+    if (options.searchInput && options.searchInput.value.trim()) params.set('q', options.searchInput.value.trim());
+    fetch('/admin/api/students?' + params.toString())
+      .then(response => response.json())
+      .then(data => {
+        data.students.forEach(student => {
+          index += 1;
+          options.tbody.appendChild(options.renderRow(student, index, cell));
+        });
+        cursor = data.next_cursor;
+        if (options.loadMoreBtn) options.loadMoreBtn.style.display = cursor ? '' : 'none';
+        if (options.countsEl) {
+          const c = data.counts;
+          options.countsEl.textContent = data.event_id
+            ? `${c.total} students · ${c.responded} responded · ${c.pending} pending`
+            : `${c.total} students`;
+        }
+      })
+      .finally(() => { loading = false; });
+  }
+
+  if (options.loadMoreBtn) options.loadMoreBtn.addEventListener('click', () => load(false));
+  if (options.statusSelect) options.statusSelect.addEventListener('change', () => load(true));
+  if (options.searchInput) {
+    options.searchInput.addEventListener('input', function() {
+      clearTimeout(searchTimer);
+      searchTimer = setTimeout(() => load(true), 300);
+    });
+  }
+  return {reload: () => load(true)};
+}
@@ -0,0 +1,86 @@
+import threading
+import time
+from flask import current_app, render_template
+from markupsafe import Markup
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from myextensions import db
+from models import Event, Course
+
+_lock = threading.Lock()
+
+def _load_active_event():
+    """
+    Load the active event with its courses and their staff, plus its question set, in a private session.
+    Returns: (event or None, questions), detached.
+    """
+    with Session(db.engine) as session:
+        stmt = select(Event).filter_by(is_active=True, is_deleted=False)\
+                            .options(selectinload(Event.courses).selectinload(Course.staffs),
+                                     selectinload(Event.questions))
+        event = session.scalars(stmt).first()
+        questions = list(event.questions) if event else []
+        return event, questions
+
+def _cache_entry():
+    app = current_app._get_current_object()
+    ttl = app.config.get('ACTIVE_EVENT_CACHE_TTL', 30)
+    with _lock:
+        entry = app.extensions.get('active_event_cache')
+        if entry is None or time.monotonic() - entry[2] > ttl:
+            event, questions = _load_active_event()
+            entry = (event, questions, time.monotonic())
+            app.extensions['active_event_cache'] = entry
+    return entry
+
+def _attached(entry):
+    event = entry[0]
+    if event is None:
+        return None
+    return db.session.merge(event, load=False)
+
+def get_active_event():
+    """
+    Return the active, non-deleted event (or None), attached to the current session.
+    The event, its courses and their staff are cached in-process, so repeat calls issue no queries.
+    The cache is dropped by invalidate_active_event() and expires after ACTIVE_EVENT_CACHE_TTL seconds.
+    """
+    return _attached(_cache_entry())
+
+def _form_body(entry):
+    event, questions = entry[0], entry[1]
+    if event is None:
+        return None
+    app = current_app._get_current_object()
+    with _lock:
+        cached = app.extensions.get('feedback_form_body')
+    if cached is not None and cached[0] is entry:
+        return cached[1]
+    body = Markup(render_template('student/feedback_form_body.html', courses=event.courses, questions=questions))
+    with _lock:
+        app.extensions['feedback_form_body'] = (entry, body)
+    return body
+
+def get_active_event_form():
+    """
+    Return (event, form body) for the active event, both taken from the same cache entry so the
+    rendered course/staff/question section always belongs to the returned event.
+    The body contains nothing student-specific, so it is rendered once per cache entry.
+    Returns: (None, None) when there is no active event.
+    """
+    entry = _cache_entry()
+    return _attached(entry), _form_body(entry)
+
+def is_event_open(event_id):
+    """
+    Check in the database, bypassing the cache, that the event is still active and not deleted.
+    The cache can lag behind another process's changes by up to ACTIVE_EVENT_CACHE_TTL seconds.
+    """
+    row = db.session.query(Event.is_active, Event.is_deleted).filter_by(id=event_id).first()
+    return row is not None and row.is_active and not row.is_deleted
+
+def invalidate_active_event():
+    """Drop the cached active event and form, e.g. after events, courses, staff or questions change."""
+    with _lock:
+        current_app.extensions.pop('active_event_cache', None)
+        current_app.extensions.pop('feedback_form_body', None)
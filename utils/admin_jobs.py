@@ -0,0 +1,62 @@
+from myextensions import db
+from models import Event
+from utils.jobs import job_handler
+from utils.excel_handler import validate_student_excel
+from utils.importers import upsert_students, import_course_staff
+from utils.report_bundle import collect_event_reports, iter_rendered_reports, stream_reports_zip
+from utils.pdf_generator import render_student_responses_pdf
+from utils.roster import invalidate_eligible_counts
+from utils.active_event import invalidate_active_event
+
+@job_handler('import_students')
+def import_students_job(ctx, path):
+    ctx.progress(5, 'Validating sheet', force=True)
+    success, message, students_data = validate_student_excel(path)
+    if not success:
+        raise ValueError(message)
+    ctx.progress(50, f'Importing {len(students_data)} students', force=True)
+    added, updated = upsert_students(students_data)
+    invalidate_eligible_counts()
+    return {'message': f'Successfully processed {len(students_data)} students '
+                       f'({added} added, {updated} updated)'}
+
+@job_handler('import_courses')
+def import_courses_job(ctx, path, batch_size=500):
+    report = import_course_staff(path, batch_size=batch_size,
+                                 on_batch=lambda r: ctx.progress(message=f"Processed {r['rows']} rows"))
+    invalidate_active_event()
+    message = (f"Processed {report['rows']} rows. Added {report['added_courses']} new courses "
+               f"and {report['added_staff']} new staff.")
+    errors = report['errors']
+    if errors:
+        message += f"\n{len(errors)} rows were skipped:\n" + "\n".join(errors[:5])
+        if len(errors) > 5:
+            message += f"\n...and {len(errors)-5} more errors"
+    return {'message': message}
+
+@job_handler('event_reports_zip')
+def event_reports_zip_job(ctx, event_id, max_workers=None):
+    event = db.session.get(Event, event_id)
+    if event is None:
+        raise ValueError('Event not found')
+    reports = collect_event_reports(event)
+    total = len(reports)
+
+    def tracked(rendered):
+        for done, item in enumerate(rendered, 1):
+            ctx.progress(done * 99 // max(total, 1), f'Rendered {done} of {total} reports')
+            yield item
+
+    with open(ctx.result_path, 'wb') as f:
+        for chunk in stream_reports_zip(tracked(iter_rendered_reports(reports, max_workers=max_workers))):
+            f.write(chunk)
+    return {'name': 'all_staff_reports.zip', 'mimetype': 'application/zip',
+            'message': f'{total} staff reports for {event.title}'}
+
+@job_handler('student_responses_pdf')
+def student_responses_pdf_job(ctx, event_id=None, eligible_only=False):
+    event = db.session.get(Event, event_id) if event_id else None
+    ctx.progress(10, 'Building response status PDF', force=True)
+    count = render_student_responses_pdf(event, ctx.result_path, eligible_only=eligible_only)
+    return {'name': 'student_responses.pdf', 'mimetype': 'application/pdf',
+            'message': f'{count} students listed'}
@@ -0,0 +1,130 @@
+from datetime import datetime
+from sqlalchemy import func, select, exists
+from myextensions import db
+from models import Event, Question, FeedbackResponse, ResultSummary
+from utils.event_questions import event_questions
+
+RATING_SCALE = (1, 2, 3, 4)
+MAX_COMPARE_EVENTS = 20
+
+def _stats_rows(*filters):
+    """
+    Read per-staff, per-question totals from the result_summary table (O(questions), not O(responses)).
+    Each row: (staff_id, question_id, count, rating_sum, count_of_1, count_of_2, ...).
+    """
+    histogram_cols = [func.sum(getattr(ResultSummary, f'rating_{r}_count')) for r in RATING_SCALE]
+    return db.session.query(ResultSummary.staff_id,
+                            ResultSummary.question_id,
+                            func.sum(ResultSummary.response_count),
+                            func.sum(ResultSummary.rating_sum),
+                            *histogram_cols)\
+                     .filter(*filters)\
+                     .group_by(ResultSummary.staff_id, ResultSummary.question_id)\
+                     .all()
+
+def _build_stats(rows, questions):
+    by_question = {row[0]: row for row in rows}
+    stats = []
+    for q in questions:
+        row = by_question.get(q.id)
+        if row and row[1]:
+            count, total = row[1], row[2]
+            histogram = {r: int(n or 0) for r, n in zip(RATING_SCALE, row[3:])}
+            stats.append({'question': q, 'average': round(total / count, 2), 'count': count,
+                          'histogram': histogram})
+        else:
+            stats.append({'question': q, 'average': 0, 'count': 0,
+                          'histogram': {r: 0 for r in RATING_SCALE}})
+    return stats
+
+def staff_question_stats(staff_id, event_id, questions=None):
+    """
+    Compute per-question average, response count and rating histogram for a staff in an event
+    using a single grouped query.
+    questions defaults to the event's question set.
+    Returns: list of dicts (question, average, count, histogram) in question order.
+    """
+    if questions is None:
+        questions = event_questions(event_id)
+    rows = _stats_rows(ResultSummary.staff_id == staff_id,
+                       ResultSummary.event_id == event_id)
+    return _build_stats([row[1:] for row in rows], questions)
+
+def event_question_stats(event_id, staff_ids, questions=None):
+    """
+    Same as staff_question_stats, but for many staff of one event in a single grouped query.
+    Returns: dict of staff_id -> list of per-question stat dicts.
+    """
+    if questions is None:
+        questions = event_questions(event_id)
+    rows_by_staff = {staff_id: [] for staff_id in staff_ids}
+    for row in _stats_rows(ResultSummary.event_id == event_id,
+                           ResultSummary.staff_id.in_(staff_ids)):
+        rows_by_staff[row[0]].append(row[1:])
+    return {staff_id: _build_stats(rows, questions) for staff_id, rows in rows_by_staff.items()}
+
+def event_responded_counts(event_id):
+    """
+    Count distinct responding students per staff for an event.
+    Returns: dict of staff_id -> count.
+    """
+    rows = db.session.query(FeedbackResponse.staff_id, func.count(func.distinct(FeedbackResponse.student_id)))\
+                     .filter(FeedbackResponse.event_id == event_id)\
+                     .group_by(FeedbackResponse.staff_id).all()
+    return dict(rows)
+
+def event_comparison(staff_id=None, course_id=None, event_ids=None, limit=10):
+    """
+    Per-question averages for one staff or course across events, read from result_summary in one grouped query.
+    event_ids picks the events explicitly; otherwise the limit most recent events (deleted ones included)
+    with results for the staff or course are compared.
+    Returns: dict with events (id, title, created_at, is_deleted, average, count; oldest first) and
+    questions (id, text, and averages/counts lists aligned with events, None where a question was not rated).
+    Raises: ValueError unless exactly one of staff_id and course_id is given.
+    """
+    if (staff_id is None) == (course_id is None):
+        raise ValueError('Give exactly one of staff_id and course_id')
+    limit = max(1, min(int(limit), MAX_COMPARE_EVENTS))
+    owner = ResultSummary.staff_id == staff_id if staff_id is not None else ResultSummary.course_id == course_id
+    events = select(Event.id).where(exists().where(ResultSummary.event_id == Event.id, owner))
+    if event_ids is not None:
+        events = events.where(Event.id.in_(event_ids))
+    events = events.order_by(Event.created_at.desc(), Event.id.desc()).limit(limit).subquery()
+    rows = db.session.query(Event.id, Event.title, Event.created_at, Event.is_deleted, ResultSummary.question_id,
+                            func.sum(ResultSummary.response_count), func.sum(ResultSummary.rating_sum))\
+                     .join(events, events.c.id == ResultSummary.event_id)\
+                     .join(Event, Event.id == ResultSummary.event_id)\
+                     .filter(owner)\
+                     .group_by(Event.id, Event.title, Event.created_at, Event.is_deleted, ResultSummary.question_id)\
+                     .all()
+
+    by_event = {}
+    totals = {}
+    for event_id, title, created_at, is_deleted, question_id, count, total in rows:
+        count, total = int(count or 0), int(total or 0)
+        event = by_event.setdefault(event_id, {'title': title, 'created_at': created_at,
+                                               'is_deleted': bool(is_deleted), 'count': 0, 'total': 0})
+        event['count'] += count
+        event['total'] += total
+        totals[(event_id, question_id)] = (count, total)
+    ordered = sorted(by_event, key=lambda event_id: (by_event[event_id]['created_at'] or datetime.min, event_id))
+    question_ids = sorted({question_id for _, question_id in totals})
+    texts = dict(db.session.query(Question.id, Question.text).filter(Question.id.in_(question_ids))) \
+        if question_ids else {}
+
+    def average(count, total):
+        return round(total / count, 2) if count else None
+
+    result_events = []
+    for event_id in ordered:
+        event = by_event[event_id]
+        result_events.append({'id': event_id, 'title': event['title'], 'is_deleted': event['is_deleted'],
+                              'created_at': event['created_at'].isoformat() if event['created_at'] else None,
+                              'average': average(event['count'], event['total']), 'count': event['count']})
+    questions = []
+    for question_id in question_ids:
+        cells = [totals.get((event_id, question_id), (0, 0)) for event_id in ordered]
+        questions.append({'id': question_id, 'text': texts.get(question_id),
+                          'averages': [average(count, total) for count, total in cells],
+                          'counts': [count for count, _ in cells]})
+    return {'events': result_events, 'questions': questions}
@@ -0,0 +1,42 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from myextensions import db
+
+def _uses_static_pool(uri):
+    # Mirrors Flask-SQLAlchemy, which gives in-memory SQLite databases a StaticPool
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory')
+
+def apply_pool_options(app):
+    """
+    Merge DB_POOL_OPTIONS (pool_size, max_overflow, pool_timeout) into SQLALCHEMY_ENGINE_OPTIONS when the
+    engine will use a QueuePool. Must run before db.init_app, which creates the engine.
+    Skipped for in-memory SQLite and when the engine options already choose a poolclass.
+    """
+    pool_options = app.config.get('DB_POOL_OPTIONS') or {}
+    engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if not pool_options or 'poolclass' in engine_options or _uses_static_pool(app.config['SQLALCHEMY_DATABASE_URI']):
+        return
+    for name, value in pool_options.items():
+        engine_options.setdefault(name, value)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+
+def configure_engine(app):
+    """
+    Apply the SQLITE_PRAGMAS from config to every new SQLite connection
+    (WAL journal, synchronous level, busy timeout, mmap and page cache size).
+    Has no effect when DATABASE_URL points at a server database.
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
@@ -0,0 +1,37 @@
+from sqlalchemy import insert
+from myextensions import db
+from models import Question, EventQuestion
+
+def event_questions(event_id):
+    """
+    Return the ordered question set of an event.
+    """
+    return Question.query.join(EventQuestion, EventQuestion.c.question_id == Question.id)\
+                         .filter(EventQuestion.c.event_id == event_id)\
+                         .order_by(EventQuestion.c.position).all()
+
+def assign_event_questions(event_id, additional_texts=()):
+    """
+    Attach the default questions followed by the additional question texts to an event.
+    Existing questions are matched by text in one query; the rest are inserted as non-default questions.
+    Does not commit.
+    Returns: number of newly created questions.
+    """
+    texts = list(dict.fromkeys(text for text in additional_texts if text))
+    existing = {}
+    if texts:
+        existing = dict(db.session.query(Question.text, Question.id).filter(Question.text.in_(texts)).all())
+    missing = [text for text in texts if text not in existing]
+    if missing:
+        created = db.session.execute(
+            insert(Question).returning(Question.id, Question.text, sort_by_parameter_order=True),
+            [{'text': text, 'is_default': False} for text in missing]).all()
+        existing.update((text, question_id) for question_id, text in created)
+    default_ids = [question_id for (question_id,) in
+                   db.session.query(Question.id).filter_by(is_default=True).order_by(Question.id)]
+    question_ids = list(dict.fromkeys(default_ids + [existing[text] for text in texts]))
+    if question_ids:
+        db.session.execute(insert(EventQuestion),
+                           [{'event_id': event_id, 'question_id': question_id, 'position': position}
+                            for position, question_id in enumerate(question_ids)])
+    return len(missing)
@@ -1,9 +1,14 @@
 import pandas as pd
+from openpyxl import load_workbook
 from flask import current_app
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
+def _as_text(series):
+    """Stringify and strip a column the way str(cell).strip() would, so blank cells become 'nan'."""
+    return series.astype(str).fillna('nan').str.strip()
+
 def validate_student_excel(file):
     """
     Validate and process an Excel file containing student data.
@@ -24,22 +29,23 @@ def validate_student_excel(file):
         for col in required_cols:
             if col not in df.columns:
                 return False, f"Missing required column: {col}", []
-        valid_data = []
+        roll_numbers = _as_text(df['roll no.'])
+        names = _as_text(df['student name'])
+        emails = _as_text(df['email address'])
+        roll_ok = roll_numbers.str.startswith('718123') & (roll_numbers.str.len() == 11) & roll_numbers.str.isdigit()
+        name_ok = names != ''
+        email_ok = (emails != '') & emails.str.contains('@', regex=False)
+        valid = roll_ok & name_ok & email_ok
+        # Report only the first failing check per row, in row order
         errors = []
-        for index, row in df.iterrows():
-            roll_number = str(row['roll no.']).strip()
-            name = str(row['student name']).strip()
-            email = str(row['email address']).strip()
-            if not roll_number.startswith('718123') or len(roll_number) != 11 or not roll_number.isdigit():
-                errors.append(f"Row {index+2}: Invalid roll number format '{roll_number}'")
-                continue
-            if not name:
+        for index in df.index[~valid]:
+            if not roll_ok[index]:
+                errors.append(f"Row {index+2}: Invalid roll number format '{roll_numbers[index]}'")
+            elif not name_ok[index]:
                 errors.append(f"Row {index+2}: Missing student name")
-                continue
-            if not email or '@' not in email:
+            else:
                 errors.append(f"Row {index+2}: Invalid or missing email address")
-                continue
-            valid_data.append((roll_number, name, email))
+        valid_data = list(zip(roll_numbers[valid], names[valid], emails[valid]))
         if not valid_data:
             return False, "No valid student data found in the file", []
         if errors:
@@ -51,42 +57,45 @@ def validate_student_excel(file):
     except Exception as e:
         return False, f"Error processing Excel file: {str(e)}", []
 
-def validate_course_staff_excel(file):
+def _cell_text(value):
+    return '' if value is None else str(value).strip()
+
+def _sheet_rows(file):
+    """Yield raw row tuples (header first) from the first sheet."""
+    filename = getattr(file, 'filename', None) or str(file)
+    if filename.lower().endswith('.xls'):
+        # openpyxl cannot read legacy .xls files
+        df = pd.read_excel(file, dtype=object)
+        yield tuple(df.columns)
+        yield from df.where(df.notna(), None).itertuples(index=False, name=None)
+        return
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+def iter_course_staff_rows(file):
     """
-    Validate and process an Excel file containing course and staff data.
-    
-    Expected format:
+    Stream rows from an Excel file containing course and staff data without loading the whole sheet
+    (.xlsx is read with openpyxl in read-only mode).
+
+    Expected format (first row is a header):
     - Column 1: Course Code
     - Column 2: Course Name
     - Column 3: Teacher Name
-    
-    Returns:
-    - success (bool), message (str), data (list of tuples: (course_code, course_name, teacher_name))
+
+    Yields:
+    - (row_number, course_code, course_name, teacher_name), blank cells as '' and fully blank rows skipped
+    Raises:
+    - ValueError if the sheet has fewer than three columns
     """
-    try:
-        df = pd.read_excel(file)
-        if len(df.columns) < 3:
-            return False, "Excel file must have at least three columns: Course Code, Course Name, Teacher Name", []
-        code_col = df.columns[0]
-        name_col = df.columns[1]
-        teacher_col = df.columns[2]
-        valid_data = []
-        errors = []
-        for index, row in df.iterrows():
-            course_code = str(row[code_col]).strip()
-            course_name = str(row[name_col]).strip()
-            teacher_name = str(row[teacher_col]).strip()
-            if not course_code or not course_name or not teacher_name:
-                errors.append(f"Row {index+2}: Missing data (Course Code, Name, or Teacher Name)")
-                continue
-            valid_data.append((course_code, course_name, teacher_name))
-        if not valid_data:
-            return False, "No valid course/staff data found in the file", []
-        if errors:
-            error_message = f"Processed with {len(errors)} errors:\n" + "\n".join(errors[:5])
-            if len(errors) > 5:
-                error_message += f"\n...and {len(errors)-5} more errors"
-            return True, error_message, valid_data
-        return True, f"Successfully processed {len(valid_data)} records", valid_data
-    except Exception as e:
-        return False, f"Error processing Excel file: {str(e)}", []
+    rows = _sheet_rows(file)
+    header = next(rows, None)
+    if header is None or len(header) < 3:
+        raise ValueError("Excel file must have at least three columns: Course Code, Course Name, Teacher Name")
+    for index, row in enumerate(rows, start=2):
+        values = tuple(row[:3]) + (None,) * (3 - len(row[:3]))
+        if all(value is None for value in values):
+            continue
+        yield (index,) + tuple(_cell_text(value) for value in values)
@@ -0,0 +1,130 @@
+import re
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import case, column, false, func, inspect, or_, and_, text
+from sqlalchemy.orm import joinedload
+from myextensions import db
+from models import GeneralFeedback
+
+INBOX_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+FTS_TABLE = 'general_feedback_fts'
+
+# External-content FTS5 index over content and admin_response, kept in sync by triggers
+FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+        USING fts5(content, admin_response, content='general_feedback', content_rowid='id')""",
+    f"""CREATE TRIGGER IF NOT EXISTS general_feedback_fts_ai AFTER INSERT ON general_feedback BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, content, admin_response) VALUES (new.id, new.content, new.admin_response);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS general_feedback_fts_ad AFTER DELETE ON general_feedback BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content, admin_response)
+        VALUES ('delete', old.id, old.content, old.admin_response);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS general_feedback_fts_au AFTER UPDATE OF content, admin_response
+        ON general_feedback BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content, admin_response)
+        VALUES ('delete', old.id, old.content, old.admin_response);
+        INSERT INTO {FTS_TABLE}(rowid, content, admin_response) VALUES (new.id, new.content, new.admin_response);
+        END""",
+]
+
+def ensure_feedback_search_index():
+    """
+    Create the SQLite FTS5 index and its triggers if missing, filling it from existing rows.
+    Does nothing on other databases, which fall back to substring search.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return
+    with db.engine.begin() as conn:
+        exists = inspect(conn).has_table(FTS_TABLE)
+        for statement in FTS_DDL:
+            conn.execute(text(statement))
+        if not exists:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+def _fts_available():
+    app = current_app._get_current_object()
+    available = app.extensions.get('feedback_fts')
+    if available is None:
+        available = db.engine.dialect.name == 'sqlite' and inspect(db.engine).has_table(FTS_TABLE)
+        app.extensions['feedback_fts'] = available
+    return available
+
+def _fts_query(search):
+    # Quote every term so user input cannot inject FTS syntax; the last term matches as a prefix
+    terms = [f'"{term}"' for term in re.findall(r'\w+', search)]
+    if not terms:
+        return None
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+def _search_filter(search):
+    if _fts_available():
+        match = _fts_query(search)
+        if match is None:
+            # Nothing searchable (e.g. only punctuation): match nothing rather than dropping the filter
+            return false()
+        matches = text(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match')\
+            .bindparams(match=match).columns(column('rowid'))
+        return GeneralFeedback.id.in_(matches)
+    return or_(GeneralFeedback.content.icontains(search, autoescape=True),
+               GeneralFeedback.admin_response.icontains(search, autoescape=True))
+
+def encode_cursor(feedback):
+    return f'{feedback.timestamp.isoformat()},{feedback.id}'
+
+def decode_cursor(cursor):
+    """Raises: ValueError for a malformed cursor."""
+    timestamp, feedback_id = cursor.rsplit(',', 1)
+    return datetime.fromisoformat(timestamp), int(feedback_id)
+
+def _apply_filters(query, category=None, status='all', search=None, student_id=None):
+    if student_id is not None:
+        query = query.filter(GeneralFeedback.student_id == student_id)
+    if category:
+        query = query.filter(GeneralFeedback.category == category)
+    if status == 'pending':
+        query = query.filter(or_(GeneralFeedback.is_resolved.is_(False), GeneralFeedback.is_resolved.is_(None)))
+    elif status == 'resolved':
+        query = query.filter(GeneralFeedback.is_resolved.is_(True))
+    if search:
+        query = query.filter(_search_filter(search))
+    return query
+
+def feedback_page(category=None, status='all', search=None, before=None, limit=INBOX_PAGE_SIZE,
+                  student_id=None, with_student=True):
+    """
+    Return one page of general feedback, newest first, keyset-paginated on (timestamp, id).
+    status: 'all', 'pending' or 'resolved'. search is matched against content and admin_response
+    (FTS5 on SQLite). before is the next_cursor of the previous page. student_id restricts the page to one
+    student's feedback; with_student=False skips eager-loading the students.
+    Returns: dict with feedbacks (students eager-loaded) and next_cursor (None on the last page).
+    Raises: ValueError for a malformed cursor.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    query = GeneralFeedback.query
+    if with_student:
+        query = query.options(joinedload(GeneralFeedback.student))
+    query = _apply_filters(query, category, status, search, student_id)
+    if before:
+        timestamp, feedback_id = decode_cursor(before)
+        query = query.filter(or_(GeneralFeedback.timestamp < timestamp,
+                                 and_(GeneralFeedback.timestamp == timestamp, GeneralFeedback.id < feedback_id)))
+    feedbacks = query.order_by(GeneralFeedback.timestamp.desc(), GeneralFeedback.id.desc()).limit(limit + 1).all()
+    has_more = len(feedbacks) > limit
+    feedbacks = feedbacks[:limit]
+    return {'feedbacks': feedbacks, 'next_cursor': encode_cursor(feedbacks[-1]) if has_more else None}
+
+def feedback_counts(category=None, recent_days=7, status='all', search=None):
+    """
+    Total, resolved, pending and recent (last recent_days) feedback counts in one aggregate query.
+    status and search filter the counted feedback the same way as feedback_page.
+    """
+    since = datetime.utcnow() - timedelta(days=recent_days)
+    query = db.session.query(func.count(GeneralFeedback.id),
+                             func.sum(case((GeneralFeedback.is_resolved.is_(True), 1), else_=0)),
+                             func.sum(case((GeneralFeedback.timestamp >= since, 1), else_=0)))
+    total, resolved, recent = _apply_filters(query, category, status, search).one()
+    resolved, recent = int(resolved or 0), int(recent or 0)
+    return {'total': total, 'resolved': resolved, 'pending': total - resolved, 'recent': recent}
@@ -0,0 +1,104 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import case, func, null
+from myextensions import db
+from models import GeneralFeedback
+
+GRANULARITIES = ('day', 'week', 'month')
+MAX_PERIODS = 366
+_LABEL_FORMATS = {'day': '%d %b %Y', 'week': '%d %b %Y', 'month': '%b %Y'}
+_stats_lock = threading.Lock()
+
+def _floor(moment, granularity):
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == 'week':
+        return start - timedelta(days=start.weekday())
+    if granularity == 'month':
+        return start.replace(day=1)
+    return start
+
+def _shift(start, granularity, steps):
+    if granularity == 'day':
+        return start + timedelta(days=steps)
+    if granularity == 'week':
+        return start + timedelta(weeks=steps)
+    month = start.year * 12 + start.month - 1 + steps
+    return start.replace(year=month // 12, month=month % 12 + 1)
+
+def bucket_boundaries(granularity='month', periods=6, end=None):
+    """
+    Calendar-aligned bucket start datetimes, oldest first, for the periods buckets ending with the one
+    containing end (default now). Weeks start on Monday; months on the 1st.
+    Returns: list of periods + 1 datetimes, the last one being the exclusive upper bound.
+    """
+    last = _floor(end or datetime.utcnow(), granularity)
+    return [_shift(last, granularity, step) for step in range(-periods + 1, 2)]
+
+def _compute_stats(granularity, periods, end, category):
+    bounds = bucket_boundaries(granularity, periods, end)
+    # Newest boundary first so each timestamp lands in the first one it passes; rows outside the range get NULL
+    whens = [(GeneralFeedback.timestamp >= bounds[-1], null())]
+    whens += [(GeneralFeedback.timestamp >= bounds[i], i) for i in range(periods - 1, -1, -1)]
+    bucket = case(*whens, else_=null()).label('bucket')
+    labelled = db.session.query(bucket, GeneralFeedback.category)
+    if category:
+        labelled = labelled.filter(GeneralFeedback.category == category)
+    # Group over a derived table so the bucket CASE (and its bound parameters) is not repeated in GROUP BY
+    labelled = labelled.subquery()
+    rows = db.session.query(labelled.c.bucket, labelled.c.category, func.count())\
+                     .group_by(labelled.c.bucket, labelled.c.category).all()
+
+    label_format = _LABEL_FORMATS[granularity]
+    series = [{'start': start.isoformat(), 'label': start.strftime(label_format), 'count': 0, 'categories': {}}
+              for start in bounds[:-1]]
+    category_totals = {}
+    for index, cat, count in rows:
+        category_totals[cat] = category_totals.get(cat, 0) + count
+        if index is not None:
+            series[index]['count'] += count
+            series[index]['categories'][cat] = count
+    return {'granularity': granularity, 'series': series, 'category_totals': category_totals}
+
+def feedback_stats(granularity='month', periods=6, end=None, category=None):
+    """
+    Bucketed general-feedback counts from a single grouped query.
+    Returns: dict with granularity, series (start, label, count and per-category counts per bucket,
+    oldest first) and category_totals (all-time counts per category).
+    Results are cached in-process for FEEDBACK_STATS_CACHE_TTL seconds.
+    Raises: ValueError for an unknown granularity or a period count outside 1..MAX_PERIODS.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity '{granularity}'")
+    if not 1 <= periods <= MAX_PERIODS:
+        raise ValueError(f'periods must be between 1 and {MAX_PERIODS}')
+    app = current_app._get_current_object()
+    ttl = app.config.get('FEEDBACK_STATS_CACHE_TTL', 60)
+    # Keyed on the current bucket so a new day/week/month misses the cache by itself
+    key = (granularity, periods, _floor(end or datetime.utcnow(), granularity), category)
+    with _stats_lock:
+        cache = app.extensions.setdefault('feedback_stats', {})
+        cached = cache.get(key)
+    if cached is not None and time.monotonic() - cached[1] <= ttl:
+        return cached[0]
+    stats = _compute_stats(granularity, periods, end, category)
+    with _stats_lock:
+        cache[key] = (stats, time.monotonic())
+    return stats
+
+def invalidate_feedback_stats():
+    """Drop cached general-feedback stats, e.g. after new feedback is submitted."""
+    with _stats_lock:
+        current_app.extensions.pop('feedback_stats', None)
+
+def feedback_stats_from_args(args, category=None):
+    """
+    feedback_stats() driven by request arguments: granularity, periods and end (ISO date).
+    Raises: ValueError for invalid arguments.
+    """
+    end = args.get('end')
+    return feedback_stats(granularity=args.get('granularity', 'month'),
+                          periods=args.get('periods', 6, type=int),
+                          end=datetime.fromisoformat(end) if end else None,
+                          category=category)
@@ -0,0 +1,49 @@
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from myextensions import db
+from models import FeedbackResponse, QuestionResponse
+from utils.result_summary import record_feedback
+from utils.report_cache import invalidate_reports
+
+UNIQUE_SUBMISSION_CONSTRAINT = 'uq_feedback_response_event_student_course'
+
+def _is_duplicate_submission(error):
+    # PostgreSQL and MySQL name the violated constraint; SQLite only lists its columns
+    message = str(error.orig)
+    if UNIQUE_SUBMISSION_CONSTRAINT in message:
+        return True
+    return 'UNIQUE constraint failed' in message and all(
+        f'feedback_response.{column}' in message for column in ('event_id', 'student_id', 'course_id'))
+
+def save_submission(student_id, event_id, courses_data):
+    """
+    Insert all of a student's responses for an event with a few executemany statements in one transaction.
+    courses_data: {course_id: {staff_id: {question_id: rating}}} as parsed from the feedback form.
+    Returns: True on success, False if the student had already submitted for this event
+    (enforced by the unique constraint on feedback_response, not a prior read).
+    Raises: IntegrityError for any other constraint failure (e.g. an unknown course or staff id).
+    """
+    responses = [(course_id, staff_id, ratings)
+                 for course_id, staffs in courses_data.items()
+                 for staff_id, ratings in staffs.items()]
+    if not responses:
+        return True
+    try:
+        feedback_ids = db.session.scalars(
+            insert(FeedbackResponse).returning(FeedbackResponse.id, sort_by_parameter_order=True),
+            [{'student_id': student_id, 'event_id': event_id, 'course_id': course_id, 'staff_id': staff_id}
+             for course_id, staff_id, _ in responses]).all()
+        rating_rows = [{'feedback_id': feedback_id, 'question_id': question_id, 'rating': rating}
+                       for feedback_id, (_, _, ratings) in zip(feedback_ids, responses)
+                       for question_id, rating in ratings.items()]
+        if rating_rows:
+            db.session.execute(insert(QuestionResponse), rating_rows)
+        record_feedback(event_id, responses)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if not _is_duplicate_submission(e):
+            raise
+        return False
+    invalidate_reports(event_id, {staff_id for _, staff_id, _ in responses})
+    return True
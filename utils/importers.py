@@ -0,0 +1,93 @@
+from sqlalchemy import insert, update
+from werkzeug.security import generate_password_hash
+from myextensions import db
+from models import Student, Course, Staff
+from utils.excel_handler import iter_course_staff_rows
+
+DEFAULT_STUDENT_PASSWORD = 'Srec@123'
+# Keep IN (...) lists well under SQLite's bound-parameter limit
+_IN_CHUNK = 500
+
+def upsert_students(students_data):
+    """
+    Insert or update students from validated (roll_number, name, email) tuples using set-based statements:
+    one IN query per chunk to find existing roll numbers, then a bulk UPDATE and a bulk INSERT.
+    The default password hash is computed once for the whole import.
+    Later rows win when a roll number appears more than once.
+    Returns: (added, updated) counts.
+    """
+    rows = {}
+    for roll_number, name, email in students_data:
+        rows[roll_number] = {'roll_number': roll_number, 'name': name, 'email': email}
+    roll_numbers = list(rows)
+    existing = {}
+    for i in range(0, len(roll_numbers), _IN_CHUNK):
+        chunk = roll_numbers[i:i + _IN_CHUNK]
+        existing.update(db.session.query(Student.roll_number, Student.id).filter(Student.roll_number.in_(chunk)).all())
+    updates = [{'id': existing[roll], 'name': row['name'], 'email': row['email']}
+               for roll, row in rows.items() if roll in existing]
+    password_hash = generate_password_hash(DEFAULT_STUDENT_PASSWORD)
+    inserts = [dict(row, password_hash=password_hash) for roll, row in rows.items() if roll not in existing]
+    if updates:
+        db.session.execute(update(Student), updates)
+    if inserts:
+        db.session.execute(insert(Student), inserts)
+    db.session.commit()
+    return len(inserts), len(updates)
+
+def import_course_staff(file, batch_size=500, on_batch=None):
+    """
+    Stream a course/staff sheet into the database, committing every batch_size rows.
+    Existing courses (by code) and staff (by course and name) are resolved from maps built once up front.
+    on_batch, if given, is called with the running report after each committed batch.
+    Returns: report dict with rows, added_courses, added_staff, existing and errors (list of row messages).
+    Raises: ValueError if the sheet layout is invalid.
+    """
+    courses = {code: (course_id, name) for course_id, code, name in
+               db.session.query(Course.id, Course.code, Course.name)}
+    staff_keys = set(db.session.query(Staff.course_id, Staff.name))
+    report = {'rows': 0, 'added_courses': 0, 'added_staff': 0, 'existing': 0, 'errors': []}
+
+    def flush_batch(batch):
+        new_courses = {}
+        for _, code, name, _ in batch:
+            if code not in courses and code not in new_courses:
+                new_courses[code] = name
+        if new_courses:
+            created = db.session.execute(
+                insert(Course).returning(Course.id, Course.code, sort_by_parameter_order=True),
+                [{'code': code, 'name': name} for code, name in new_courses.items()]).all()
+            for course_id, code in created:
+                courses[code] = (course_id, new_courses[code])
+            report['added_courses'] += len(created)
+        new_staff = []
+        for row_number, code, name, teacher in batch:
+            course_id, existing_name = courses[code]
+            if existing_name != name:
+                report['errors'].append(f"Row {row_number}: Course code '{code}' already exists as '{existing_name}'")
+                continue
+            if (course_id, teacher) in staff_keys:
+                report['existing'] += 1
+                continue
+            staff_keys.add((course_id, teacher))
+            new_staff.append({'name': teacher, 'course_id': course_id})
+        if new_staff:
+            db.session.execute(insert(Staff), new_staff)
+            report['added_staff'] += len(new_staff)
+        db.session.commit()
+        if on_batch is not None:
+            on_batch(report)
+
+    batch = []
+    for row_number, code, name, teacher in iter_course_staff_rows(file):
+        report['rows'] += 1
+        if not code or not name or not teacher:
+            report['errors'].append(f"Row {row_number}: Missing data (Course Code, Name, or Teacher Name)")
+            continue
+        batch.append((row_number, code, name, teacher))
+        if len(batch) >= batch_size:
+            flush_batch(batch)
+            batch = []
+    if batch:
+        flush_batch(batch)
+    return report
@@ -0,0 +1,185 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import or_
+from myextensions import db
+from models import Job
+
+JOB_HANDLERS = {}
+ACTIVE_STATUSES = ('queued', 'running')
+_executor_lock = threading.Lock()
+_worker = {}
+# Minimum seconds between progress writes, so chatty handlers do not hammer the database
+_PROGRESS_INTERVAL = 0.5
+
+def job_handler(kind):
+    """
+    Register a function as the handler for a job kind.
+    The handler is called as handler(ctx, **params) inside an app context and returns a dict with
+    an optional message and, for jobs that produce a file, name and mimetype of the file written to ctx.result_path.
+    """
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return decorator
+
+class JobContext:
+    """Handed to job handlers for progress reporting and file locations."""
+
+    def __init__(self, job_id, job_dir):
+        self.job_id = job_id
+        self.job_dir = job_dir
+        self.result_path = os.path.join(job_dir, 'result')
+        self._last_write = 0.0
+
+    def progress(self, percent=None, message=None, force=False):
+        """
+        Record progress (0-100) and/or a status message. Commits the session, so call it between
+        units of work rather than in the middle of a transaction.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_write < _PROGRESS_INTERVAL:
+            return
+        self._last_write = now
+        values = {}
+        if percent is not None:
+            values['progress'] = max(0, min(100, int(percent)))
+        if message is not None:
+            values['message'] = message
+        if values:
+            Job.query.filter_by(id=self.job_id, status='running').update(values)
+            db.session.commit()
+
+def _job_root(app):
+    return app.config.get('JOB_DIR') or os.path.join(app.instance_path, 'jobs')
+
+def _worker_id():
+    # Regenerated after a fork so each process heartbeats only its own jobs
+    pid = os.getpid()
+    with _executor_lock:
+        if _worker.get('pid') != pid:
+            _worker.update(pid=pid, id=uuid.uuid4().hex)
+        return _worker['id']
+
+def _heartbeat(app, worker, interval):
+    while True:
+        time.sleep(interval)
+        with app.app_context():
+            try:
+                Job.query.filter(Job.worker == worker, Job.status.in_(ACTIVE_STATUSES))\
+                         .update({'heartbeat_at': datetime.utcnow()}, synchronize_session=False)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                app.logger.exception('Job heartbeat failed')
+
+def _get_executor(app):
+    worker = _worker_id()
+    with _executor_lock:
+        executor = app.extensions.get('job_executor', {}).get(worker)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=app.config.get('JOB_WORKERS', 2),
+                                          thread_name_prefix='admin-job')
+            app.extensions['job_executor'] = {worker: executor}
+            threading.Thread(target=_heartbeat, args=(app, worker, app.config.get('JOB_HEARTBEAT_SECONDS', 15)),
+                             name='admin-job-heartbeat', daemon=True).start()
+    return executor
+
+def _run_job(app, job_id, kind, params):
+    with app.app_context():
+        ctx = JobContext(job_id, os.path.join(_job_root(app), job_id))
+        try:
+            started = Job.query.filter_by(id=job_id, status='queued')\
+                               .update({'status': 'running', 'started_at': datetime.utcnow()})
+            db.session.commit()
+            if not started:
+                return  # failed as orphaned (or removed) before a thread picked it up
+            result = JOB_HANDLERS[kind](ctx, **params) or {}
+            values = {'status': 'succeeded', 'progress': 100, 'finished_at': datetime.utcnow(),
+                      'message': result.get('message')}
+            if result.get('name'):
+                values.update(result_path=ctx.result_path, result_name=result['name'],
+                              result_mimetype=result.get('mimetype', 'application/octet-stream'))
+            # Only a running job is finished, so a job already failed as orphaned keeps that state
+            Job.query.filter_by(id=job_id, status='running').update(values)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.exception('Job %s (%s) failed', job_id, kind)
+            Job.query.filter_by(id=job_id, status='running').update({'status': 'failed',
+                                                                     'finished_at': datetime.utcnow(),
+                                                                     'message': str(e)})
+            db.session.commit()
+
+def enqueue_job(kind, params=None, upload=None, user_id=None):
+    """
+    Create a queued job and submit it to the background thread pool.
+    upload: optional werkzeug FileStorage saved into the job directory first; its path is passed
+    to the handler as the 'path' parameter (request files cannot be read after the request ends).
+    Returns: the Job row.
+    Raises: KeyError for an unknown job kind.
+    """
+    if kind not in JOB_HANDLERS:
+        raise KeyError(f"Unknown job kind '{kind}'")
+    app = current_app._get_current_object()
+    prune_jobs()
+    params = dict(params or {})
+    job = Job(id=uuid.uuid4().hex, kind=kind, status='queued', progress=0, created_by=user_id,
+              worker=_worker_id(), heartbeat_at=datetime.utcnow())
+    job_dir = os.path.join(_job_root(app), job.id)
+    os.makedirs(job_dir, exist_ok=True)
+    if upload is not None:
+        path = os.path.join(job_dir, 'upload' + os.path.splitext(upload.filename or '')[1].lower())
+        upload.save(path)
+        params['path'] = path
+    executor = _get_executor(app)
+    db.session.add(job)
+    db.session.commit()
+    executor.submit(_run_job, app, job.id, kind, params)
+    return job
+
+def prune_jobs():
+    """Delete finished jobs older than JOB_RETENTION_HOURS together with their files."""
+    app = current_app._get_current_object()
+    fail_orphaned_jobs()
+    cutoff = datetime.utcnow() - timedelta(hours=app.config.get('JOB_RETENTION_HOURS', 24))
+    stale = [job_id for (job_id,) in db.session.query(Job.id).filter(Job.status.in_(('succeeded', 'failed')),
+                                                                      Job.created_at < cutoff)]
+    if not stale:
+        return
+    for job_id in stale:
+        shutil.rmtree(os.path.join(_job_root(app), job_id), ignore_errors=True)
+    Job.query.filter(Job.id.in_(stale)).delete(synchronize_session=False)
+    db.session.commit()
+
+def fail_orphaned_jobs():
+    """
+    Mark queued or running jobs whose owning process stopped heartbeating (it exited or was restarted)
+    as failed, so their pages stop polling. Jobs of live processes, in any worker or host, are untouched.
+    Returns: number of jobs marked failed.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=4 * current_app.config.get('JOB_HEARTBEAT_SECONDS', 15))
+    count = Job.query.filter(Job.status.in_(ACTIVE_STATUSES),
+                             or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < cutoff))\
+                     .update({'status': 'failed', 'finished_at': datetime.utcnow(),
+                              'message': 'Interrupted by a server restart; please run it again.'},
+                             synchronize_session=False)
+    db.session.commit()
+    return count
+
+def job_status(job):
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'message': job.message,
+        'has_result': bool(job.result_path) and job.status == 'succeeded',
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
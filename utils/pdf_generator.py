@@ -1,97 +1,185 @@
 import io
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
+from reportlab.lib.pagesizes import letter, landscape
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.graphics.shapes import Drawing
 from reportlab.lib.units import inch
 from myextensions import db
-from models import Staff, Course, Event, Question, FeedbackResponse, QuestionResponse, Student
+from models import Staff, Course, Event, FeedbackResponse, Student
+from utils.aggregation import staff_question_stats
+from utils.roster import eligible_student_count, iter_response_status
+
+# Styles and table templates are built once per process and shared by every render
+STYLES = getSampleStyleSheet()
+TITLE_STYLE = STYLES['Heading1']
+SUBTITLE_STYLE = STYLES['Heading2']
+NORMAL_STYLE = STYLES['Normal']
+SECTION_STYLE = STYLES['Heading4']
+
+REPORT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.grey),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0,0), (-1,0), 12),
+    ('BACKGROUND', (0,1), (-1,-1), colors.beige),
+    ('GRID', (0,0), (-1,-1), 1, colors.black)
+])
+REPORT_COL_WIDTHS = [4*inch, 1*inch, 1*inch]
+
+STUDENT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#007bff')),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,0), 12),
+    ('FONTSIZE', (0,1), (-1,-1), 10),
+    ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.whitesmoke, colors.lightgrey]),
+    ('GRID', (0,0), (-1,-1), 0.5, colors.grey),
+])
+# Rows per student-status table; bounded so table layout stays linear in the number of students
+STUDENT_SECTION_ROWS = 200
+
+def report_filename(course_code, staff_name, event_title):
+    return f"report_{course_code}_{staff_name.replace(' ', '_')}_{event_title.replace(' ', '_')}.pdf"
 
 def generate_pdf_report(staff_id, event_id):
     """
     Generate a PDF report for a specific staff and event.
     Returns: BytesIO object containing the PDF.
     """
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter,
-                            rightMargin=72, leftMargin=72,
-                            topMargin=72, bottomMargin=72)
-    elements = []
-    styles = getSampleStyleSheet()
-    title_style = styles['Heading1']
-    subtitle_style = styles['Heading2']
-    normal_style = styles['Normal']
+    return render_pdf_report(build_report_data(staff_id, event_id))
 
+def build_report_data(staff_id, event_id):
+    """
+    Gather everything a staff report shows, as the plain dict render_pdf_report expects.
+    """
     staff = Staff.query.get_or_404(staff_id)
     event = Event.query.get_or_404(event_id)
     course = Course.query.get_or_404(staff.course_id)
 
-    elements.append(Paragraph("Feedback Report", title_style))
-    elements.append(Spacer(1, 0.25*inch))
-    elements.append(Paragraph(f"Event: {event.title}", subtitle_style))
-    elements.append(Paragraph(f"Course: {course.code} - {course.name}", subtitle_style))
-    elements.append(Paragraph(f"Staff: {staff.name}", subtitle_style))
-    elements.append(Spacer(1, 0.5*inch))
-
-    feedback_responses = FeedbackResponse.query.filter_by(staff_id=staff_id, event_id=event_id).all()
-    questions = Question.query.all()
-    question_data = []
-    for question in questions:
-        ratings = []
-        for feedback in feedback_responses:
-            response = QuestionResponse.query.filter_by(feedback_id=feedback.id, question_id=question.id).first()
-            if response:
-                ratings.append(response.rating)
-        if ratings:
-            avg = sum(ratings) / len(ratings)
-            question_data.append((question.text, round(avg, 2), len(ratings)))
-        else:
-            question_data.append((question.text, 0, 0))
-
-    table_data = [['Question', 'Average Rating', 'Responses']]
-    table_data.extend(question_data)
-    table = Table(table_data, colWidths=[4*inch, 1*inch, 1*inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.grey),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0,0), (-1,0), 12),
-        ('BACKGROUND', (0,1), (-1,-1), colors.beige),
-        ('GRID', (0,0), (-1,-1), 1, colors.black)
-    ]))
-    elements.append(table)
-    elements.append(Spacer(1, 0.5*inch))
+    question_data = [(stat['question'].text, stat['average'], stat['count'])
+                     for stat in staff_question_stats(staff_id, event_id)]
+    responded_students = db.session.query(Student.id).join(FeedbackResponse, Student.id == FeedbackResponse.student_id)\
+                         .filter(FeedbackResponse.staff_id == staff_id, FeedbackResponse.event_id == event_id)\
+                         .distinct().count()
+    total_students = eligible_student_count(event)
+    return {
+        'event_title': event.title,
+        'course_code': course.code,
+        'course_name': course.name,
+        'staff_name': staff.name,
+        'question_data': question_data,
+        'responded_students': responded_students,
+        'total_students': total_students,
+    }
 
+def rating_chart(averages):
+    """
+    Build the bar chart drawing of average rating per question (Q1..Qn on a 0-4 scale).
+    Chart widgets hold per-report data, so a fresh drawing is needed for every report.
+    """
     drawing = Drawing(500, 250)
     bc = VerticalBarChart()
     bc.x = 50
     bc.y = 50
     bc.height = 150
     bc.width = 400
-    bc.data = [[data[1] for data in question_data]]
+    bc.data = [list(averages)]
     bc.valueAxis.valueMin = 0
     bc.valueAxis.valueMax = 4
     bc.valueAxis.valueStep = 1
-    bc.categoryAxis.labels = [f"Q{i+1}" for i in range(len(question_data))]
+    bc.categoryAxis.labels = [f"Q{i+1}" for i in range(len(bc.data[0]))]
     bc.barLabelFormat = '%.2f'
     drawing.add(bc)
-    elements.append(drawing)
-    elements.append(Spacer(1, 0.5*inch))
+    return drawing
 
-    responded_students = db.session.query(Student.id).join(FeedbackResponse, Student.id == FeedbackResponse.student_id)\
-                         .filter(FeedbackResponse.staff_id == staff_id, FeedbackResponse.event_id == event_id)\
-                         .distinct().count()
-    total_students = Student.query.count()
-    elements.append(Paragraph("Participation Statistics", subtitle_style))
-    elements.append(Paragraph(f"Responses: {responded_students} students", normal_style))
-    elements.append(Paragraph(f"Total Students: {total_students} students", normal_style))
+def _report_elements(report):
+    question_data = report['question_data']
+    table = Table([['Question', 'Average Rating', 'Responses']] + list(question_data), colWidths=REPORT_COL_WIDTHS)
+    table.setStyle(REPORT_TABLE_STYLE)
+    elements = [
+        Paragraph("Feedback Report", TITLE_STYLE),
+        Spacer(1, 0.25*inch),
+        Paragraph(f"Event: {report['event_title']}", SUBTITLE_STYLE),
+        Paragraph(f"Course: {report['course_code']} - {report['course_name']}", SUBTITLE_STYLE),
+        Paragraph(f"Staff: {report['staff_name']}", SUBTITLE_STYLE),
+        Spacer(1, 0.5*inch),
+        table,
+        Spacer(1, 0.5*inch),
+        rating_chart(data[1] for data in question_data),
+        Spacer(1, 0.5*inch),
+    ]
+
+    responded_students = report['responded_students']
+    total_students = report['total_students']
+    elements.append(Paragraph("Participation Statistics", SUBTITLE_STYLE))
+    elements.append(Paragraph(f"Responses: {responded_students} students", NORMAL_STYLE))
+    elements.append(Paragraph(f"Total Students: {total_students} students", NORMAL_STYLE))
     if total_students > 0:
         response_rate = (responded_students / total_students) * 100
-        elements.append(Paragraph(f"Response Rate: {response_rate:.2f}%", normal_style))
+        elements.append(Paragraph(f"Response Rate: {response_rate:.2f}%", NORMAL_STYLE))
+    return elements
 
-    doc.build(elements)
+def render_pdf_report(report):
+    """
+    Render a feedback report from plain data (no database access, so it can run in a worker process).
+    Expects keys: event_title, course_code, course_name, staff_name,
+    question_data (list of (question_text, average, count)), responded_students, total_students.
+    Returns: BytesIO object containing the PDF.
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                            rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=72)
+    doc.build(_report_elements(report))
     buffer.seek(0)
     return buffer
+
+def render_pdf_reports(reports):
+    """
+    Render many report dicts (see render_pdf_report) in one call, sharing the module-level styles.
+    Returns: list of PDF bytes, in the order of reports.
+    """
+    return [render_pdf_report(report).getvalue() for report in reports]
+
+def render_student_responses_pdf(event, out, eligible_only=False, section_rows=STUDENT_SECTION_ROWS):
+    """
+    Write the response status (Yes/No per student, in roll number order) for an event to out,
+    a path or binary file object. With no event every student is listed as not responded;
+    eligible_only restricts the list to the event's roll range.
+    Rows are streamed from the database and laid out as one table per section_rows students, headed by
+    its roll number range, since ReportLab's table splitting gets superlinear in the row count.
+    Returns: number of students listed.
+    """
+    event_title = event.title if event else 'No Event'
+    event_date = event.created_at.strftime('%Y-%m-%d') if event and event.created_at else ''
+    pdf_title = f'Student Response Status - {event_title} ({event_date})'
+    if event and eligible_only and not event.is_open_to_all:
+        pdf_title += f' - Roll numbers {event.start_roll_number} to {event.end_roll_number}'
+    elements = [Paragraph(pdf_title, NORMAL_STYLE)]
+    header = ['S.No', 'Roll Number', 'Name', 'Response']
+    section = []
+    count = 0
+
+    def flush():
+        elements.append(Paragraph(f'Roll numbers {section[0][1]} to {section[-1][1]}', SECTION_STYLE))
+        table = Table([header] + section, repeatRows=1)
+        table.setStyle(STUDENT_TABLE_STYLE)
+        elements.append(table)
+        section.clear()
+
+    for rows in iter_response_status(event, eligible_only):
+        for roll_number, name, responded in rows:
+            count += 1
+            section.append([str(count), roll_number, name, 'Yes' if responded else 'No'])
+            if len(section) == section_rows:
+                flush()
+    if section:
+        flush()
+    if not count:
+        elements.append(Paragraph('No students found.', NORMAL_STYLE))
+    SimpleDocTemplate(out, pagesize=landscape(letter)).build(elements)
+    return count
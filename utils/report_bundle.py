@@ -0,0 +1,70 @@
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from myextensions import db
+from models import Course, Staff, EventCourse
+from utils.aggregation import event_question_stats, event_responded_counts
+from utils.event_questions import event_questions
+from utils.pdf_generator import render_pdf_reports, report_filename
+from utils.roster import eligible_student_count
+from utils.streaming import StreamSink
+
+def collect_event_reports(event):
+    """
+    Precompute report data for every staff whose course is attached to the event, in a fixed number of queries.
+    Returns: list of (filename, report dict) ready for render_pdf_report.
+    """
+    staffs = db.session.query(Staff, Course)\
+                       .join(Course, Course.id == Staff.course_id)\
+                       .join(EventCourse, EventCourse.c.course_id == Course.id)\
+                       .filter(EventCourse.c.event_id == event.id)\
+                       .order_by(Course.code, Staff.name).all()
+    questions = event_questions(event.id)
+    stats = event_question_stats(event.id, [staff.id for staff, _ in staffs], questions)
+    responded = event_responded_counts(event.id)
+    total_students = eligible_student_count(event)
+    reports = []
+    for staff, course in staffs:
+        report = {
+            'event_title': event.title,
+            'course_code': course.code,
+            'course_name': course.name,
+            'staff_name': staff.name,
+            'question_data': [(s['question'].text, s['average'], s['count']) for s in stats[staff.id]],
+            'responded_students': responded.get(staff.id, 0),
+            'total_students': total_students,
+        }
+        reports.append((report_filename(course.code, staff.name, event.title), report))
+    return reports
+
+def _render_batch(items):
+    filenames = [filename for filename, _ in items]
+    return list(zip(filenames, render_pdf_reports([report for _, report in items])))
+
+def iter_rendered_reports(reports, max_workers=None, batch_size=8):
+    """
+    Render reports across a process pool, yielding (filename, pdf_bytes) as each batch finishes.
+    Reports are sent to the workers batch_size at a time so each task amortises its pickling overhead.
+    With max_workers <= 1 the reports are rendered in-process.
+    """
+    if max_workers is not None and max_workers <= 1:
+        for item in reports:
+            yield from _render_batch([item])
+        return
+    batches = [reports[i:i + batch_size] for i in range(0, len(reports), batch_size)]
+    # Spawned rather than forked: this runs on a job thread, and forking a threaded process can copy held locks
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [executor.submit(_render_batch, batch) for batch in batches]
+        for future in as_completed(futures):
+            yield from future.result()
+
+def stream_reports_zip(rendered):
+    """
+    Stream a ZIP archive built from (filename, pdf_bytes) pairs, yielding bytes after each entry is written.
+    """
+    sink = StreamSink()
+    with zipfile.ZipFile(sink, 'w') as zipf:
+        for filename, pdf_bytes in rendered:
+            zipf.writestr(filename, pdf_bytes)
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,97 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+import uuid
+from flask import current_app
+from utils.pdf_generator import build_report_data, render_pdf_report
+
+# Bump when render_pdf_report output changes so old entries stop matching
+REPORT_LAYOUT_VERSION = 1
+_evict_lock = threading.Lock()
+
+def _cache_dir():
+    app = current_app._get_current_object()
+    path = app.config.get('REPORT_CACHE_DIR') or os.path.join(app.instance_path, 'report_cache')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def report_digest(report):
+    """Content address of a report: a hash of everything the PDF is rendered from."""
+    payload = json.dumps({'layout': REPORT_LAYOUT_VERSION, 'report': report}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _entry_path(cache_dir, event_id, staff_id, digest):
+    return os.path.join(cache_dir, f'{event_id}-{staff_id}-{digest}.pdf')
+
+def _open_hit(path):
+    # Opened before returning, so a concurrent eviction cannot remove the file under the response
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    os.utime(path)
+    return f
+
+def _store(cache_dir, path, pdf_bytes):
+    tmp_path = os.path.join(cache_dir, f'.tmp-{uuid.uuid4().hex}')
+    with open(tmp_path, 'wb') as f:
+        f.write(pdf_bytes)
+    os.replace(tmp_path, path)
+
+def _evict(cache_dir, max_bytes, keep):
+    """Delete least recently used entries (by mtime), other than keep, until the cache fits in max_bytes."""
+    with _evict_lock:
+        entries = []
+        for entry in os.scandir(cache_dir):
+            if entry.name.endswith('.pdf') and entry.path != keep:
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries) + os.path.getsize(keep)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+def open_cached_report(staff, event):
+    """
+    Return the rendered PDF report for a staff and event as an open binary file, rendering it on a cache miss.
+    Entries are keyed on (event, staff, digest of the report data), so changed data never matches
+    a stale file. That includes past events: their eligible student count (the response rate denominator)
+    still changes when students are imported or deleted.
+    """
+    cache_dir = _cache_dir()
+    report = build_report_data(staff.id, event.id)
+    path = _entry_path(cache_dir, event.id, staff.id, report_digest(report))
+    hit = _open_hit(path)
+    if hit:
+        return hit
+    _store(cache_dir, path, render_pdf_report(report).getvalue())
+    f = open(path, 'rb')
+    _evict(cache_dir, current_app.config.get('REPORT_CACHE_MAX_MB', 256) * 1024 * 1024, keep=path)
+    return f
+
+def invalidate_reports(event_id, staff_ids=None):
+    """Remove cached reports for an event (optionally only some staff), e.g. after new responses arrive."""
+    cache_dir = _cache_dir()
+    patterns = [f'{event_id}-{staff_id}-*.pdf' for staff_id in staff_ids] if staff_ids else [f'{event_id}-*.pdf']
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(cache_dir, pattern)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+def clear_report_cache():
+    """Remove every cached report, e.g. after bulk deletes that change past results."""
+    cache_dir = _cache_dir()
+    for path in glob.glob(os.path.join(cache_dir, '*.pdf')):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
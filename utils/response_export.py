@@ -0,0 +1,84 @@
+import csv
+import io
+from sqlalchemy import select
+from myextensions import db
+from models import Student, Course, Staff, Question, FeedbackResponse, QuestionResponse
+from utils.streaming import StreamSink
+
+EXPORT_COLUMNS = ('roll_number', 'student_name', 'course_code', 'course_name', 'staff_name',
+                  'question_id', 'question_text', 'rating', 'submitted_at')
+EXPORT_FORMATS = ('csv', 'parquet')
+
+def _export_statement(event_id):
+    return select(Student.roll_number, Student.name, Course.code, Course.name, Staff.name,
+                  Question.id, Question.text, QuestionResponse.rating, FeedbackResponse.submitted_at)\
+        .select_from(QuestionResponse)\
+        .join(FeedbackResponse, FeedbackResponse.id == QuestionResponse.feedback_id)\
+        .join(Student, Student.id == FeedbackResponse.student_id)\
+        .join(Course, Course.id == FeedbackResponse.course_id)\
+        .join(Staff, Staff.id == FeedbackResponse.staff_id)\
+        .join(Question, Question.id == QuestionResponse.question_id)\
+        .where(FeedbackResponse.event_id == event_id)\
+        .order_by(FeedbackResponse.id, QuestionResponse.question_id)
+
+def iter_response_chunks(event_id, chunk_size=5000):
+    """
+    Stream every rating of an event as lists of row tuples (in EXPORT_COLUMNS order),
+    fetched chunk_size rows at a time with yield_per so memory stays flat.
+    """
+    stmt = _export_statement(event_id).execution_options(yield_per=chunk_size)
+    for partition in db.session.execute(stmt).partitions():
+        yield partition
+
+def iter_csv(event_id, chunk_size=5000):
+    """Yield the event's ratings as CSV text, one chunk per database partition."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in iter_response_chunks(event_id, chunk_size):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError('Parquet export requires the pyarrow package')
+    return pyarrow, pyarrow.parquet
+
+def iter_parquet(event_id, chunk_size=5000):
+    """
+    Yield the event's ratings as a Parquet file, writing one row group per database partition.
+    Raises: RuntimeError if pyarrow is not installed.
+    """
+    pa, pq = _require_pyarrow()
+    schema = pa.schema([('roll_number', pa.string()), ('student_name', pa.string()),
+                        ('course_code', pa.string()), ('course_name', pa.string()),
+                        ('staff_name', pa.string()), ('question_id', pa.int32()),
+                        ('question_text', pa.string()), ('rating', pa.int8()),
+                        ('submitted_at', pa.timestamp('us'))])
+    sink = StreamSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for rows in iter_response_chunks(event_id, chunk_size):
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+def iter_export(event_id, fmt='csv', chunk_size=5000):
+    """
+    Stream an event's raw ratings in the given format ('csv' or 'parquet').
+    Raises: ValueError for an unknown format, RuntimeError if Parquet support is missing.
+    """
+    if fmt == 'csv':
+        return (chunk.encode('utf-8') for chunk in iter_csv(event_id, chunk_size))
+    if fmt == 'parquet':
+        # Fail before the response starts streaming rather than halfway through it
+        _require_pyarrow()
+        return iter_parquet(event_id, chunk_size)
+    raise ValueError(f"Unknown export format '{fmt}'")
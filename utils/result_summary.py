@@ -0,0 +1,74 @@
+from sqlalchemy import func, case, insert, select
+from sqlalchemy.dialects import sqlite, postgresql
+from myextensions import db
+from models import ResultSummary, FeedbackResponse, QuestionResponse
+from utils.aggregation import RATING_SCALE
+
+_KEY_COLUMNS = ('event_id', 'course_id', 'staff_id', 'question_id')
+_COUNTER_COLUMNS = ('response_count', 'rating_sum') + tuple(f'rating_{r}_count' for r in RATING_SCALE)
+
+def _upsert_statement():
+    """Insert that adds to the existing counters when the (event, course, staff, question) row already exists."""
+    dialects = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+    dialect_insert = dialects.get(db.engine.dialect.name)
+    if dialect_insert is None:
+        return None
+    stmt = dialect_insert(ResultSummary.__table__)
+    table = ResultSummary.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c[col] for col in _KEY_COLUMNS],
+        set_={col: table.c[col] + stmt.excluded[col] for col in _COUNTER_COLUMNS})
+
+def record_feedback(event_id, responses):
+    """
+    Add newly submitted ratings to the summary table in the caller's transaction.
+    responses: iterable of (course_id, staff_id, {question_id: rating}).
+    """
+    rows = []
+    for course_id, staff_id, ratings in responses:
+        for question_id, rating in ratings.items():
+            row = {'event_id': event_id, 'course_id': course_id, 'staff_id': staff_id,
+                   'question_id': question_id, 'response_count': 1, 'rating_sum': rating}
+            for r in RATING_SCALE:
+                row[f'rating_{r}_count'] = 1 if rating == r else 0
+            rows.append(row)
+    if not rows:
+        return
+    stmt = _upsert_statement()
+    if stmt is not None:
+        db.session.execute(stmt, rows)
+        return
+    # Generic fallback for databases without ON CONFLICT support
+    for row in rows:
+        key = tuple(row[col] for col in _KEY_COLUMNS)
+        summary = db.session.get(ResultSummary, key)
+        if summary is None:
+            db.session.add(ResultSummary(**row))
+        else:
+            for col in _COUNTER_COLUMNS:
+                setattr(summary, col, getattr(summary, col) + row[col])
+
+def rebuild_summaries(event_id=None):
+    """
+    Recompute summary rows from the raw QuestionResponse data, for one event or all events.
+    Returns: number of summary rows written.
+    """
+    delete_query = ResultSummary.query
+    if event_id is not None:
+        delete_query = delete_query.filter_by(event_id=event_id)
+    delete_query.delete(synchronize_session=False)
+    source = select(FeedbackResponse.event_id,
+                    FeedbackResponse.course_id,
+                    FeedbackResponse.staff_id,
+                    QuestionResponse.question_id,
+                    func.count(QuestionResponse.id),
+                    func.sum(QuestionResponse.rating),
+                    *[func.sum(case((QuestionResponse.rating == r, 1), else_=0)) for r in RATING_SCALE])\
+        .join(FeedbackResponse, FeedbackResponse.id == QuestionResponse.feedback_id)\
+        .group_by(FeedbackResponse.event_id, FeedbackResponse.course_id,
+                  FeedbackResponse.staff_id, QuestionResponse.question_id)
+    if event_id is not None:
+        source = source.where(FeedbackResponse.event_id == event_id)
+    result = db.session.execute(insert(ResultSummary).from_select(list(_KEY_COLUMNS + _COUNTER_COLUMNS), source))
+    db.session.commit()
+    return result.rowcount
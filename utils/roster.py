@@ -0,0 +1,146 @@
+import threading
+import time
+from flask import current_app
+from sqlalchemy import func, case, exists, or_, and_, false, select
+from sqlalchemy.orm import aliased
+from myextensions import db
+from models import Student, FeedbackResponse
+
+MAX_PAGE_SIZE = 200
+_eligible_lock = threading.Lock()
+
+def _responded_clause(event_id):
+    return exists().where(FeedbackResponse.student_id == Student.id, FeedbackResponse.event_id == event_id)
+
+def student_roster(event_id=None, after=None, limit=50, status='all', roll_from=None, roll_to=None, search=None):
+    """
+    Return one page of students ordered by roll number, using keyset pagination (roll_number > after).
+    status: 'all', 'responded' or 'pending' (needs event_id). roll_from/roll_to bound the roll number range
+    and search matches the name or the start of the roll number.
+    Returns: dict with students (roll_number, name, id, responded), next_cursor (None on the last page)
+    and counts (total, responded, pending) for the filters, computed in SQL.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    filters = []
+    if roll_from:
+        filters.append(Student.roll_number >= roll_from)
+    if roll_to:
+        filters.append(Student.roll_number <= roll_to)
+    if search:
+        filters.append(or_(Student.name.icontains(search, autoescape=True),
+                           Student.roll_number.startswith(search, autoescape=True)))
+    responded = _responded_clause(event_id) if event_id else None
+
+    if responded is not None:
+        total, responded_count = db.session.query(func.count(Student.id),
+                                                  func.sum(case((responded, 1), else_=0)))\
+                                           .filter(*filters).one()
+    else:
+        total, responded_count = db.session.query(func.count(Student.id)).filter(*filters).scalar(), 0
+    responded_count = int(responded_count or 0)
+
+    if responded is not None and status == 'responded':
+        filters.append(responded)
+    elif responded is not None and status == 'pending':
+        filters.append(~responded)
+    if after:
+        filters.append(Student.roll_number > after)
+    columns = [Student.id, Student.roll_number, Student.name]
+    if responded is not None:
+        columns.append(responded.label('responded'))
+    rows = db.session.query(*columns).filter(*filters).order_by(Student.roll_number).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    students = [{'id': row.id, 'roll_number': row.roll_number, 'name': row.name,
+                 'responded': bool(row.responded) if responded is not None else False}
+                for row in rows]
+    return {
+        'students': students,
+        'next_cursor': rows[-1].roll_number if has_more else None,
+        'counts': {'total': total, 'responded': responded_count, 'pending': total - responded_count},
+    }
+
+def eligible_students_filter(event):
+    """
+    SQL criteria for the students an event is open to, mirroring the student-side roll number check:
+    everyone when is_open_to_all, nobody when the roll range is incomplete, else start <= roll <= end.
+    """
+    if event.is_open_to_all:
+        return []
+    if not (event.start_roll_number and event.end_roll_number):
+        return [false()]
+    return [Student.roll_number >= event.start_roll_number, Student.roll_number <= event.end_roll_number]
+
+def is_student_eligible(event, roll_number):
+    """Python counterpart of eligible_students_filter for a single roll number."""
+    if event.is_open_to_all:
+        return True
+    if not (event.start_roll_number and event.end_roll_number):
+        return False
+    return event.start_roll_number <= roll_number <= event.end_roll_number
+
+def eligible_student_count(event):
+    """
+    Number of students the event is open to, used as the response-rate denominator.
+    Cached in-process per (event, roll range), so a changed range misses the cache by itself;
+    invalidate_eligible_counts() drops entries when students are imported or deleted.
+    """
+    app = current_app._get_current_object()
+    ttl = app.config.get('ELIGIBLE_COUNT_CACHE_TTL', 300)
+    key = (event.id, bool(event.is_open_to_all), event.start_roll_number, event.end_roll_number)
+    with _eligible_lock:
+        cache = app.extensions.setdefault('eligible_counts', {})
+        cached = cache.get(key)
+    if cached is not None and time.monotonic() - cached[1] <= ttl:
+        return cached[0]
+    count = db.session.query(func.count(Student.id)).filter(*eligible_students_filter(event)).scalar()
+    with _eligible_lock:
+        cache[key] = (count, time.monotonic())
+    return count
+
+def invalidate_eligible_counts():
+    """Drop all cached eligible-population counts, e.g. after students are added or removed."""
+    with _eligible_lock:
+        current_app.extensions.pop('eligible_counts', None)
+
+def non_responders(event, staff_id=None, after=None, limit=100, count_only=False):
+    """
+    Eligible students with no feedback for the event (or for one staff in it), as a LEFT JOIN anti-join
+    instead of NOT IN over every responded id.
+    Returns: the count when count_only, else dict with students (roll_number, name), next_cursor and count.
+    """
+    feedback = aliased(FeedbackResponse)
+    join_on = [feedback.student_id == Student.id, feedback.event_id == event.id]
+    if staff_id is not None:
+        join_on.append(feedback.staff_id == staff_id)
+    query = db.session.query(Student.roll_number, Student.name)\
+                      .outerjoin(feedback, and_(*join_on))\
+                      .filter(feedback.id.is_(None), *eligible_students_filter(event))
+    count = query.with_entities(func.count(Student.id)).scalar()
+    if count_only:
+        return count
+    if after:
+        query = query.filter(Student.roll_number > after)
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    rows = query.order_by(Student.roll_number).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'students': [{'roll_number': row.roll_number, 'name': row.name} for row in rows],
+        'next_cursor': rows[-1].roll_number if has_more else None,
+        'count': count,
+    }
+
+def iter_response_status(event=None, eligible_only=False, chunk_size=1000):
+    """
+    Stream (roll_number, name, responded) for every student in roll number order, as lists of up to
+    chunk_size rows read from a server-side cursor. With no event nobody has responded; eligible_only
+    restricts the students to the event's roll range.
+    """
+    columns = [Student.roll_number, Student.name]
+    columns.append(_responded_clause(event.id).label('responded') if event else false().label('responded'))
+    stmt = select(*columns).order_by(Student.roll_number)
+    if event and eligible_only:
+        stmt = stmt.where(*eligible_students_filter(event))
+    for partition in db.session.execute(stmt.execution_options(yield_per=chunk_size)).partitions():
+        yield partition
@@ -0,0 +1,41 @@
+from myextensions import db
+from models import Student, FeedbackResponse, QuestionResponse
+from utils.event_questions import event_questions
+from utils.roster import MAX_PAGE_SIZE
+
+def staff_responses_page(staff_id, event_id, after=None, limit=100):
+    """
+    Return one page of a staff's feedback for an event, keyset-paginated on the feedback id (id > after).
+    The page of feedback rows, their students and ratings come from a single joined query.
+    Returns: dict with questions (the event's ordered question set), responses (feedback_id, student_name,
+    roll_number, submitted_at, ratings as {question_id: rating}) and next_cursor (None on the last page).
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    page = db.session.query(FeedbackResponse.id)\
+                     .filter(FeedbackResponse.staff_id == staff_id, FeedbackResponse.event_id == event_id)
+    if after:
+        page = page.filter(FeedbackResponse.id > after)
+    page = page.order_by(FeedbackResponse.id).limit(limit + 1).subquery()
+    rows = db.session.query(FeedbackResponse.id, FeedbackResponse.submitted_at, Student.name, Student.roll_number,
+                            QuestionResponse.question_id, QuestionResponse.rating)\
+                     .join(page, page.c.id == FeedbackResponse.id)\
+                     .join(Student, Student.id == FeedbackResponse.student_id)\
+                     .outerjoin(QuestionResponse, QuestionResponse.feedback_id == FeedbackResponse.id)\
+                     .order_by(FeedbackResponse.id).all()
+    responses = {}
+    for feedback_id, submitted_at, name, roll_number, question_id, rating in rows:
+        entry = responses.get(feedback_id)
+        if entry is None:
+            entry = responses[feedback_id] = {'feedback_id': feedback_id, 'student_name': name,
+                                              'roll_number': roll_number, 'submitted_at': submitted_at,
+                                              'ratings': {}}
+        if question_id is not None:
+            entry['ratings'][question_id] = rating
+    responses = list(responses.values())
+    has_more = len(responses) > limit
+    responses = responses[:limit]
+    return {
+        'questions': event_questions(event_id),
+        'responses': responses,
+        'next_cursor': responses[-1]['feedback_id'] if has_more else None,
+    }
@@ -0,0 +1,46 @@
+import io
+import unicodedata
+from urllib.parse import quote
+from werkzeug.datastructures import Headers
+
+class StreamSink(io.RawIOBase):
+    """
+    Unseekable sink for writers that produce files sequentially (zipfile, Parquet),
+    handing back whatever has been written since the last drain so it can be streamed out.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def attachment_disposition(filename):
+    """
+    Content-Disposition value for a streamed download, quoted the way werkzeug's send_file does it:
+    non-ASCII names get an ASCII fallback plus an RFC 5987 filename* parameter.
+    """
+    headers = Headers()
+    try:
+        filename.encode('ascii')
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+        headers.set('Content-Disposition', 'attachment', filename=simple,
+                    **{'filename*': f"UTF-8''{quote(filename, safe='!#$&+^`|~')}"})
+    else:
+        headers.set('Content-Disposition', 'attachment', filename=filename)
+    return headers['Content-Disposition']
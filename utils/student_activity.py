@@ -0,0 +1,38 @@
+from sqlalchemy import func
+from myextensions import db
+from models import Event, FeedbackResponse
+from utils.feedback_inbox import feedback_page
+from utils.roster import is_student_eligible
+
+def student_activity(student, active_event=None, before=None, limit=10):
+    """
+    Summarise a student's activity for API clients in two indexed queries:
+    course feedback submissions per event and one page of general-feedback history (newest first).
+    Returns: dict with active_event (eligible/submitted status or None), events (submissions, newest first),
+    general_feedback and next_cursor for the history page.
+    Raises: ValueError for a malformed cursor.
+    """
+    submissions = db.session.query(Event.id, Event.title, Event.is_active, Event.is_deleted,
+                                   func.min(FeedbackResponse.submitted_at))\
+                            .join(FeedbackResponse, FeedbackResponse.event_id == Event.id)\
+                            .filter(FeedbackResponse.student_id == student.id)\
+                            .group_by(Event.id, Event.title, Event.is_active, Event.is_deleted)\
+                            .order_by(func.min(FeedbackResponse.submitted_at).desc()).all()
+    events = [{'id': event_id, 'title': title, 'is_active': bool(is_active), 'is_past': bool(is_deleted),
+               'submitted_at': submitted_at.isoformat() if submitted_at else None}
+              for event_id, title, is_active, is_deleted, submitted_at in submissions]
+    active = None
+    if active_event is not None:
+        submitted = next((e for e in events if e['id'] == active_event.id), None)
+        active = {'id': active_event.id, 'title': active_event.title,
+                  'eligible': is_student_eligible(active_event, student.roll_number),
+                  'submitted': submitted is not None,
+                  'submitted_at': submitted['submitted_at'] if submitted else None}
+
+    page = feedback_page(student_id=student.id, before=before, limit=limit, with_student=False)
+    history = [{'id': f.id, 'category': f.category, 'content': f.content,
+                'timestamp': f.timestamp.isoformat() if f.timestamp else None,
+                'is_resolved': bool(f.is_resolved), 'admin_response': f.admin_response}
+               for f in page['feedbacks']]
+    return {'active_event': active, 'events': events,
+            'general_feedback': history, 'next_cursor': page['next_cursor']}